@@ -0,0 +1,106 @@
+# benchmarks/numbering_scaling.py
+
+"""Check that scope numbering stays linear in section size for deep templates.
+
+Usage:
+    python -m benchmarks.numbering_scaling [--depth 6] [--max-nodes 64000] [--tolerance 3.0]
+
+Renders one top-level section of doubling size, nested --depth levels deep
+(at least 3), with every numbering scheme. Exits with status 1 if the time
+per node for the largest section exceeds the smallest by more than
+--tolerance times, which a quadratic counter would do long before the
+largest size.
+"""
+
+import argparse
+import gc
+import sys
+import time
+
+from logic.scope_model import ScopeNode
+from logic.scope_renderer import NUMBERING_SCHEMES, render_section
+
+
+def build_section(node_count, depth, fan_out=3):
+    """A checked section of about node_count nodes, nested depth levels deep.
+
+    The width is at level 3, the first level numbered with a deep scheme:
+    one subsection holds one item whose children each carry a full subtree
+    of the remaining levels.
+    """
+    def build(level):
+        if level > depth:
+            return []
+        return [
+            ScopeNode(f"Item {level}.{number}", checked=True, children=build(level + 1))
+            for number in range(fan_out)
+        ]
+
+    subtree_size = sum(fan_out ** level for level in range(depth - 2))
+    items = [
+        ScopeNode(f"Item 3.{number}", checked=True, children=build(4))
+        for number in range(max(1, node_count // subtree_size))
+    ]
+    item = ScopeNode("Item 2", checked=True, children=items)
+    subsection = ScopeNode("Subsection", checked=True, children=[item])
+    return ScopeNode("Section", checked=True, children=[subsection])
+
+
+def count_nodes(node):
+    return 1 + sum(count_nodes(child) for child in node.children)
+
+
+def time_render(section, scheme, repeat):
+    # Like timeit, keep the garbage collector out of the measurement
+    gc.collect()
+    gc.disable()
+    try:
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            render_section(section, scheme)
+            best = min(best, time.perf_counter() - start)
+    finally:
+        gc.enable()
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark scope numbering on deep sections.")
+    parser.add_argument("--depth", type=int, default=6, help="Levels below the section (default: 6)")
+    parser.add_argument("--max-nodes", type=int, default=64000, help="Approximate size of the largest section")
+    parser.add_argument("--repeat", type=int, default=5, help="Timings per size; the best is kept")
+    parser.add_argument("--tolerance", type=float, default=3.0,
+                        help="Allowed growth in time per node from the smallest to the largest size")
+    args = parser.parse_args(argv)
+    if args.depth < 3:
+        parser.error("--depth must be at least 3 to reach the deep numbering levels")
+
+    sizes = []
+    size = 1000
+    while size <= args.max_nodes:
+        sizes.append(size)
+        size *= 2
+
+    failures = 0
+    for scheme in NUMBERING_SCHEMES:
+        per_node = []
+        for target in sizes:
+            section = build_section(target, args.depth)
+            nodes = count_nodes(section)
+            elapsed = time_render(section, scheme, args.repeat)
+            per_node.append(elapsed / nodes)
+            print(f"{scheme:>6} {nodes:>8} nodes  {elapsed * 1000:8.2f} ms  {per_node[-1] * 1e6:6.2f} us/node")
+
+        growth = per_node[-1] / per_node[0]
+        if growth > args.tolerance:
+            failures += 1
+            print(f"{scheme:>6} NOT LINEAR: time per node grew {growth:.1f}x", file=sys.stderr)
+        else:
+            print(f"{scheme:>6} linear: time per node grew {growth:.1f}x")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
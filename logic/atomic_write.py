@@ -0,0 +1,92 @@
+# logic/atomic_write.py
+
+from contextlib import contextmanager
+import json
+import os
+import shutil
+import tempfile
+
+# Rotating backups kept for user templates and projects (file.json.bak1 is the newest)
+DEFAULT_BACKUPS = 2
+
+# mkstemp creates files readable only by the owner; new files get the usual mode instead
+_umask = os.umask(0)
+os.umask(_umask)
+NEW_FILE_MODE = 0o666 & ~_umask
+
+
+def backup_path(file_path, number):
+    return f"{file_path}.bak{number}"
+
+
+def rotate_backups(file_path, backups):
+    """Shift file.bak1..bakN along and copy the current file to file.bak1"""
+    if backups <= 0 or not os.path.exists(file_path):
+        return
+    for number in range(backups - 1, 0, -1):
+        older = backup_path(file_path, number)
+        if os.path.exists(older):
+            os.replace(older, backup_path(file_path, number + 1))
+    newest = backup_path(file_path, 1)
+    if os.path.exists(newest):
+        os.remove(newest)
+    try:
+        # A hard link is instant; the original keeps its inode after the rename
+        os.link(file_path, newest)
+    except OSError:
+        shutil.copy2(file_path, newest)
+
+
+def _fsync_directory(directory):
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        # Directories cannot be opened on Windows; the rename is durable there
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+@contextmanager
+def atomic_open(file_path, mode="w", encoding="utf-8", backups=0):
+    """Open a temporary file that replaces file_path only once fully written.
+
+    The data is written next to the destination, flushed and fsynced, then
+    renamed over it with os.replace, so readers and crashes see either the
+    old file or the new one, never a truncated mix.
+    """
+    directory = os.path.dirname(os.path.abspath(file_path))
+    fd, temp_path = tempfile.mkstemp(prefix=".", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, mode, encoding=None if "b" in mode else encoding) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+
+        if os.path.exists(file_path):
+            shutil.copymode(file_path, temp_path)
+        else:
+            os.chmod(temp_path, NEW_FILE_MODE)
+        rotate_backups(file_path, backups)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        raise
+    _fsync_directory(directory)
+
+
+def atomic_write_text(file_path, text, backups=0):
+    with atomic_open(file_path, "w", backups=backups) as f:
+        f.write(text)
+
+
+def atomic_write_json(file_path, data, indent=None, backups=0):
+    # Serializing up front turns json.dump's many small writes into one
+    atomic_write_text(file_path, json.dumps(data, indent=indent), backups)
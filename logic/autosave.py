@@ -0,0 +1,250 @@
+# logic/autosave.py
+
+"""Append-only journal of scope tree mutations, for crash recovery.
+
+A journal starts with the template that was loaded, followed by one JSON
+record per line for every edit. Nodes are addressed by their row path at
+the time of the edit (and edited nodes also by their node ID, when the
+template has them), so replaying the records in order against the same
+template reproduces the tree.
+"""
+
+import json
+import os
+import queue
+import threading
+import time
+
+from logic.atomic_write import atomic_write_text
+from logic.scope_model import ScopeNode, iter_nodes
+
+JOURNAL_FILE = os.path.join("data", ".autosave_journal")
+
+# Seconds without edits before pending records are written, and the longest
+# a record may wait during a continuous burst of edits
+AUTOSAVE_DELAY = 1.0
+AUTOSAVE_MAX_DELAY = 10.0
+
+
+class JournalError(ValueError):
+    """Raised when journal records do not fit the tree they are replayed on.
+
+    applied is the number of records replayed before the failing one.
+    """
+    def __init__(self, message, applied=0):
+        super().__init__(message)
+        self.applied = applied
+
+
+def row_path(node):
+    path = []
+    while node.parent is not None:
+        path.append(node.row)
+        node = node.parent
+    path.reverse()
+    return path
+
+
+def is_attached(node, root):
+    """True if node is root or one of its descendants"""
+    while node.parent is not None:
+        node = node.parent
+    return node is root
+
+
+def node_at(root, path):
+    node = root
+    for row in path:
+        node = node.children[row]
+    return node
+
+
+def node_to_record(node):
+    record = {
+        "title": node.title,
+        "locked": node.locked,
+        "highlight": node.highlight,
+        "checked": node.checked
+    }
+    if node.node_id is not None:
+        record["id"] = node.node_id
+    if node.children:
+        record["children"] = [node_to_record(child) for child in node.children]
+    return record
+
+
+def node_from_record(record):
+    return ScopeNode(
+        record["title"], record["locked"], record["highlight"], record["checked"],
+        [node_from_record(child) for child in record.get("children", [])],
+        record.get("id")
+    )
+
+
+def start_record(template_path):
+    return {"op": "start", "template": template_path}
+
+
+def set_record(node, attribute, value):
+    record = {"op": "set", "path": row_path(node), "attr": attribute, "value": value}
+    if node.node_id is not None:
+        record["id"] = node.node_id
+    return record
+
+
+def insert_record(parent, row, nodes):
+    return {"op": "insert", "path": row_path(parent), "row": row, "items": [node_to_record(node) for node in nodes]}
+
+
+def remove_record(parent, row, count):
+    return {"op": "remove", "path": row_path(parent), "row": row, "count": count}
+
+
+def saved_record(project_path):
+    return {"op": "saved", "project": project_path}
+
+
+def read_journal(journal_path=JOURNAL_FILE):
+    """Return (template_path, edit records) for unsaved work, or None.
+
+    A partly written last line (from a crash mid-append) is ignored.
+    """
+    try:
+        with open(journal_path, "r", encoding="utf-8") as f:
+            lines = f.readlines()
+    except OSError:
+        return None
+
+    records = []
+    for line in lines:
+        try:
+            records.append(json.loads(line))
+        except ValueError:
+            break
+    if not records or records[0].get("op") != "start":
+        return None
+
+    edits = records[1:]
+    # Nothing to recover if the last thing that happened was a save
+    if not edits or edits[-1].get("op") == "saved":
+        return None
+    return records[0]["template"], edits
+
+
+def apply_records(root, records):
+    """Replay journal records onto the tree under root, in place.
+
+    Raises JournalError at the first record that does not fit; the records
+    before it stay applied.
+    """
+    ids = None
+    for applied, record in enumerate(records):
+        try:
+            op = record.get("op")
+            if op == "set":
+                if "id" in record:
+                    if ids is None:
+                        ids = {node.node_id: node for node in iter_nodes(root.children) if node.node_id is not None}
+                    node = ids[record["id"]]
+                else:
+                    node = node_at(root, record["path"])
+                setattr(node, record["attr"], record["value"])
+            elif op == "insert":
+                parent = node_at(root, record["path"])
+                nodes = [node_from_record(item) for item in record["items"]]
+                parent.insert_children(record["row"], nodes)
+                if ids is not None:
+                    ids.update((node.node_id, node) for node in iter_nodes(nodes) if node.node_id is not None)
+            elif op == "remove":
+                node_at(root, record["path"]).remove_children(record["row"], record["count"])
+        except (AttributeError, IndexError, KeyError, TypeError):
+            raise JournalError(f"Autosave record {applied + 1} does not match the template.", applied) from None
+
+
+_STOP = object()
+
+
+class _Reset:
+    def __init__(self, records):
+        self.records = records
+
+
+class JournalWriter:
+    """Writes journal records on a background thread.
+
+    append() only queues; records are written in one batch once edits pause
+    for AUTOSAVE_DELAY seconds, so a burst of clicks costs a single write.
+    """
+    def __init__(self, journal_path=JOURNAL_FILE, delay=AUTOSAVE_DELAY, max_delay=AUTOSAVE_MAX_DELAY):
+        self.journal_path = journal_path
+        self.delay = delay
+        self.max_delay = max_delay
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="autosave", daemon=True)
+        self._thread.start()
+
+    def append(self, record):
+        self._queue.put(record)
+
+    def reset(self, records):
+        """Start a new journal containing only records"""
+        self._queue.put(_Reset(records))
+
+    def discard(self):
+        self._queue.put(_Reset(None))
+
+    def close(self):
+        """Write anything pending and stop the worker thread"""
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    def _run(self):
+        pending = []
+        first_pending = 0.0
+        while True:
+            if pending:
+                timeout = min(self.delay, max(0.0, first_pending + self.max_delay - time.monotonic()))
+            else:
+                timeout = None
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                self._append(pending)
+                pending = []
+                continue
+
+            if item is _STOP:
+                self._append(pending)
+                return
+            if isinstance(item, _Reset):
+                pending = []
+                self._rewrite(item.records)
+                continue
+            if not pending:
+                first_pending = time.monotonic()
+            pending.append(item)
+            if time.monotonic() - first_pending >= self.max_delay:
+                self._append(pending)
+                pending = []
+
+    def _append(self, records):
+        if not records:
+            return
+        try:
+            with open(self.journal_path, "a", encoding="utf-8") as f:
+                f.write("".join(json.dumps(record) + "\n" for record in records))
+                f.flush()
+                os.fsync(f.fileno())
+        except OSError:
+            # Autosave is best effort; the user's own saves are unaffected
+            pass
+
+    def _rewrite(self, records):
+        try:
+            if records is None:
+                if os.path.exists(self.journal_path):
+                    os.remove(self.journal_path)
+            else:
+                atomic_write_text(self.journal_path, "".join(json.dumps(record) + "\n" for record in records))
+        except OSError:
+            pass
@@ -0,0 +1,99 @@
+# logic/batch.py
+
+"""Render every saved project in a folder to text and/or HTML.
+
+Usage:
+    python -m logic.batch data/saved_projects -o exports --format text html
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import os
+import sys
+import time
+
+from logic.atomic_write import atomic_write_text
+from logic.save_manager import load_project
+from logic.scope_model import load_template_data, resolve_template_path
+from logic.scope_renderer import DEEP_NUMBERING, NUMBERING_SCHEMES, render_project
+
+EXTENSIONS = {"text": ".txt", "html": ".html"}
+
+
+def find_projects(project_dir):
+    return [
+        os.path.join(project_dir, file)
+        for file in sorted(os.listdir(project_dir))
+        if file.endswith(".json")
+    ]
+
+
+def render_project_file(project_path, output_dir, formats, deep_numbering=DEEP_NUMBERING):
+    """Render one project; returns (project_path, written_files, error)"""
+    try:
+        project = load_project(project_path)
+        if project is None:
+            return project_path, [], "project not found"
+
+        template_path = resolve_template_path(project.get("template_file", ""), project_path)
+        # Parsed once per worker process through the shared template cache
+        template_data = load_template_data(template_path)
+
+        base_name = os.path.splitext(os.path.basename(project_path))[0]
+        written = []
+        for output_format in formats:
+            content = render_project(template_data, project, output_format, deep_numbering=deep_numbering)
+            out_path = os.path.join(output_dir, base_name + EXTENSIONS[output_format])
+            atomic_write_text(out_path, content)
+            written.append(out_path)
+        return project_path, written, None
+    except Exception as e:
+        return project_path, [], str(e)
+
+
+def run_batch(project_paths, output_dir, formats, workers=None, deep_numbering=DEEP_NUMBERING):
+    """Render projects in a process pool; returns (results, elapsed_seconds)"""
+    os.makedirs(output_dir, exist_ok=True)
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        chunksize = max(1, len(project_paths) // ((workers or os.cpu_count() or 1) * 4))
+        results = list(executor.map(
+            render_project_file,
+            project_paths,
+            [output_dir] * len(project_paths),
+            [formats] * len(project_paths),
+            [deep_numbering] * len(project_paths),
+            chunksize=chunksize
+        ))
+    return results, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render all saved ScopeBuilder projects in a folder.")
+    parser.add_argument("project_dir", help="Folder of saved project JSON files")
+    parser.add_argument("-o", "--output-dir", default="exports", help="Folder for rendered files")
+    parser.add_argument("--format", nargs="+", choices=sorted(EXTENSIONS), default=["text"])
+    parser.add_argument("--deep-numbering", choices=NUMBERING_SCHEMES, default=DEEP_NUMBERING,
+                        help="Label scheme for items nested below level 2")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    project_paths = find_projects(args.project_dir)
+    if not project_paths:
+        print(f"No project files found in {args.project_dir}")
+        return 0
+
+    results, elapsed = run_batch(project_paths, args.output_dir, args.format, args.workers, args.deep_numbering)
+
+    failures = [(path, error) for path, _, error in results if error]
+    for path, error in failures:
+        print(f"FAILED {path}: {error}", file=sys.stderr)
+
+    rendered = len(results) - len(failures)
+    rate = rendered / elapsed if elapsed > 0 else float("inf")
+    print(f"Rendered {rendered}/{len(results)} projects in {elapsed:.2f}s ({rate:.1f} projects/s)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,205 @@
+# logic/library_index.py
+
+from dataclasses import dataclass, asdict
+import base64
+import json
+import os
+import threading
+
+from watchdog.events import FileSystemEventHandler
+from watchdog.observers import Observer
+
+from logic.atomic_write import atomic_write_json
+
+# Stored without a .json extension so folder listings never pick it up
+INDEX_FILE_NAME = ".library_index"
+
+
+@dataclass
+class LibraryEntry:
+    """Summary of one template or saved project file."""
+    name: str
+    template_name: str = ""
+    section_count: int = 0
+    item_count: int = 0
+    mtime: float = 0.0
+    size: int = 0
+
+
+def _count_items(items):
+    return sum(1 + _count_items(item.get("children", [])) for item in items)
+
+
+def summarize_file(file_path, mtime, size):
+    """Build a LibraryEntry for a template or project JSON file"""
+    entry = LibraryEntry(name=os.path.basename(file_path), mtime=mtime, size=size)
+    try:
+        with open(file_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return entry
+    if not isinstance(data, dict):
+        return entry
+
+    if "sections" in data:
+        sections = data.get("sections", [])
+        entry.template_name = data.get("template_name", "")
+        entry.section_count = len(sections)
+        entry.item_count = _count_items(sections)
+    elif "checked_bits" in data:
+        entry.template_name = os.path.basename(data.get("template_file", ""))
+        try:
+            entry.item_count = sum(bin(byte).count("1") for byte in base64.b64decode(data["checked_bits"]))
+        except ValueError:
+            pass
+    elif "checked_ids" in data:
+        # Sections cannot be counted without opening the template
+        entry.template_name = os.path.basename(data.get("template_file", ""))
+        entry.item_count = len(data.get("checked_ids", []))
+    elif "checked_items" in data:
+        checked = data.get("checked_items", [])
+        entry.template_name = os.path.basename(data.get("template_file", ""))
+        entry.section_count = len({path[0] for path in checked if path})
+        entry.item_count = len(checked)
+    return entry
+
+
+class LibraryIndex:
+    """Persistent summary of the JSON files in one folder.
+
+    The index is saved in the folder itself and kept current by a watchdog
+    observer, so browsers can list thousands of files without touching them.
+    Listeners are called with no arguments after every change, on whichever
+    thread detected it.
+    """
+    def __init__(self, folder_path):
+        self.folder_path = folder_path
+        self.index_path = os.path.join(folder_path, INDEX_FILE_NAME)
+        self._entries = {}
+        self._listeners = []
+        self._lock = threading.RLock()
+        self._observer = None
+        self._load()
+
+    def entries(self):
+        with self._lock:
+            return sorted(self._entries.values(), key=lambda entry: entry.name)
+
+    def refresh(self):
+        """Re-summarize files whose mtime or size changed since the index was saved"""
+        os.makedirs(self.folder_path, exist_ok=True)
+        with self._lock:
+            seen = set()
+            changed = False
+            with os.scandir(self.folder_path) as it:
+                for dir_entry in it:
+                    if not dir_entry.name.endswith(".json") or not dir_entry.is_file():
+                        continue
+                    seen.add(dir_entry.name)
+                    stat = dir_entry.stat()
+                    changed |= self._update(dir_entry.path, stat.st_mtime, stat.st_size)
+
+            for name in set(self._entries) - seen:
+                del self._entries[name]
+                changed = True
+
+            if changed:
+                self._save()
+        if changed:
+            self._notify()
+
+    def update_path(self, file_path):
+        """Bring the entry for one file up to date (it may have been deleted)"""
+        if not file_path.endswith(".json") or os.path.dirname(os.path.abspath(file_path)) != os.path.abspath(self.folder_path):
+            return
+        with self._lock:
+            try:
+                stat = os.stat(file_path)
+            except OSError:
+                changed = self._entries.pop(os.path.basename(file_path), None) is not None
+            else:
+                changed = self._update(file_path, stat.st_mtime, stat.st_size)
+            if changed:
+                self._save()
+        if changed:
+            self._notify()
+
+    def _update(self, file_path, mtime, size):
+        name = os.path.basename(file_path)
+        current = self._entries.get(name)
+        if current is not None and current.mtime == mtime and current.size == size:
+            return False
+        self._entries[name] = summarize_file(file_path, mtime, size)
+        return True
+
+    def add_listener(self, callback):
+        with self._lock:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        with self._lock:
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+
+    def _notify(self):
+        with self._lock:
+            listeners = list(self._listeners)
+        for callback in listeners:
+            callback()
+
+    def start_watching(self):
+        if self._observer is not None:
+            return
+        self._observer = Observer()
+        self._observer.schedule(_IndexEventHandler(self), self.folder_path, recursive=False)
+        self._observer.start()
+
+    def stop_watching(self):
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+
+    def _load(self):
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                records = json.load(f)
+            self._entries = {record["name"]: LibraryEntry(**record) for record in records}
+        except (OSError, ValueError, TypeError, KeyError):
+            self._entries = {}
+
+    def _save(self):
+        try:
+            atomic_write_json(self.index_path, [asdict(entry) for entry in self._entries.values()])
+        except OSError:
+            # The index is only a cache; it is rebuilt on the next refresh
+            pass
+
+
+class _IndexEventHandler(FileSystemEventHandler):
+    def __init__(self, index):
+        super().__init__()
+        self.index = index
+
+    def on_any_event(self, event):
+        if event.is_directory:
+            return
+        self.index.update_path(event.src_path)
+        dest_path = getattr(event, "dest_path", "")
+        if dest_path:
+            self.index.update_path(dest_path)
+
+
+_indexes = {}
+
+
+def get_library_index(folder_path):
+    """Return the shared, watched index for a folder, creating it on first use"""
+    key = os.path.abspath(folder_path)
+    index = _indexes.get(key)
+    if index is None:
+        index = LibraryIndex(folder_path)
+        index.refresh()
+        index.start_watching()
+        _indexes[key] = index
+    return index
@@ -0,0 +1,98 @@
+# logic/migrate_projects.py
+
+"""Upgrade saved projects from title paths to stable node IDs.
+
+Usage:
+    python -m logic.migrate_projects data/saved_projects [--assign-template-ids]
+    python -m logic.migrate_projects data/saved_projects --compact | --expand
+
+Projects are only upgraded when their template has node IDs. Templates get
+IDs when saved in the template editor, or here with --assign-template-ids.
+--compact rewrites projects as template-hash + bitset files; --expand
+converts them back.
+"""
+
+import argparse
+import os
+import sys
+
+from logic.atomic_write import DEFAULT_BACKUPS, atomic_write_json
+from logic.batch import find_projects
+from logic.save_manager import compact_project, expand_project, load_project, migrate_project
+from logic.scope_model import (
+    assign_node_ids, has_node_ids, load_template_data, nodes_from_sections,
+    resolve_template_path, sections_from_nodes
+)
+
+
+def add_template_ids(template_path, template_data):
+    """Write IDs into a template that lacks them; returns its nodes"""
+    nodes = nodes_from_sections(template_data.get("sections", []))
+    if not has_node_ids(nodes):
+        next_id = assign_node_ids(nodes, template_data.get("next_id"))
+        data = dict(template_data, next_id=next_id, sections=sections_from_nodes(nodes))
+        atomic_write_json(template_path, data, indent=4, backups=DEFAULT_BACKUPS)
+    return nodes
+
+
+def migrate_project_file(project_path, assign_template_ids=False, encoding=None):
+    """Upgrade one project file in place; returns True if it was rewritten.
+
+    encoding may be "compact" or "expanded" to convert between the bitset
+    and JSON list formats after upgrading.
+    """
+    project = load_project(project_path)
+    if project is None:
+        return False
+    if encoding is None and "checked_bits" in project:
+        # Compact projects stay compact unless asked otherwise
+        return False
+
+    template_path = resolve_template_path(project.get("template_file", ""), project_path)
+    template_data = load_template_data(template_path)
+    if assign_template_ids:
+        nodes = add_template_ids(template_path, template_data)
+    else:
+        nodes = nodes_from_sections(template_data.get("sections", []))
+
+    upgraded = migrate_project(expand_project(project, nodes), nodes)
+    if encoding == "compact":
+        upgraded = compact_project(upgraded, nodes)
+    if upgraded == project:
+        return False
+    indent = None if "checked_bits" in upgraded else 4
+    atomic_write_json(project_path, upgraded, indent, backups=DEFAULT_BACKUPS)
+    return True
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Upgrade saved projects to node ID sets.")
+    parser.add_argument("project_dir", help="Folder of saved project JSON files")
+    parser.add_argument(
+        "--assign-template-ids", action="store_true",
+        help="Add node IDs to templates that do not have them yet"
+    )
+    encoding = parser.add_mutually_exclusive_group()
+    encoding.add_argument("--compact", action="store_const", const="compact", dest="encoding",
+                          help="Store checked items as a template hash plus bitset")
+    encoding.add_argument("--expand", action="store_const", const="expanded", dest="encoding",
+                          help="Convert compact projects back to JSON lists")
+    args = parser.parse_args(argv)
+
+    upgraded = 0
+    failures = 0
+    project_paths = find_projects(args.project_dir) if os.path.isdir(args.project_dir) else []
+    for project_path in project_paths:
+        try:
+            if migrate_project_file(project_path, args.assign_template_ids, args.encoding):
+                upgraded += 1
+        except Exception as e:
+            failures += 1
+            print(f"FAILED {project_path}: {e}", file=sys.stderr)
+
+    print(f"Rewrote {upgraded}/{len(project_paths)} projects")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
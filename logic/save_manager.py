@@ -1,14 +1,30 @@
+from logic.atomic_write import DEFAULT_BACKUPS, atomic_write_json
+from logic.scope_model import (
+    get_checked_ids, get_checked_paths, has_node_ids, iter_nodes, load_template_data,
+    match_checked_ids, match_checked_paths, nodes_from_sections
+)
+import base64
+import hashlib
 import json
 import os
 
+# Version 2 projects store checked node IDs; version 1 stored title paths
+PROJECT_VERSION = 2
+
+
+class TemplateMismatch(ValueError):
+    """Raised when a compact project's template has changed since it was saved."""
 
-def save_project(file_path, template_path, checked_paths):
-    data = {
-        "template_file": template_path,
-        "checked_items": checked_paths
-    }
-    with open(file_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=4)
+
+def save_project(file_path, template_path, checked_paths=None, checked_ids=None):
+    """Save a project, preferring node IDs when the template has them"""
+    data = {"template_file": template_path}
+    if checked_ids is not None:
+        data["version"] = PROJECT_VERSION
+        data["checked_ids"] = sorted(checked_ids)
+    else:
+        data["checked_items"] = checked_paths or []
+    atomic_write_json(file_path, data, indent=4, backups=DEFAULT_BACKUPS)
 
 
 def load_project(file_path):
@@ -16,3 +32,114 @@ def load_project(file_path):
         return None
     with open(file_path, "r", encoding="utf-8") as f:
         return json.load(f)
+
+
+def _structure(nodes):
+    return [[node.title, _structure(node.children)] for node in nodes]
+
+
+def template_hash(nodes):
+    """Hash of a template's titles and nesting; compact projects are only valid for it"""
+    content = json.dumps(_structure(nodes), ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()[:16]
+
+
+def encode_checked_bits(nodes):
+    """Encode checked state as a base64 bitset over the nodes in pre-order"""
+    bits = bytearray()
+    for position, node in enumerate(iter_nodes(nodes)):
+        if node.checked:
+            byte = position >> 3
+            if byte >= len(bits):
+                bits.extend(bytes(byte - len(bits) + 1))
+            bits[byte] |= 1 << (position & 7)
+    return base64.b64encode(bits).decode("ascii")
+
+
+def decode_checked_bits(encoded, nodes):
+    """Return the nodes whose bits are set in an encoded bitset"""
+    try:
+        bits = base64.b64decode(encoded, validate=True)
+    except (TypeError, ValueError):
+        raise TemplateMismatch("The project's checked items are damaged and cannot be restored.") from None
+    limit = len(bits) * 8
+    return [
+        node for position, node in enumerate(iter_nodes(nodes))
+        if position < limit and bits[position >> 3] >> (position & 7) & 1
+    ]
+
+
+def _compact_data(template_path, nodes):
+    return {
+        "template_file": template_path,
+        "template_hash": template_hash(nodes),
+        "checked_bits": encode_checked_bits(nodes)
+    }
+
+
+def _apply_project(project, nodes):
+    # Make the nodes' checked flags match the project exactly
+    for node in iter_nodes(nodes):
+        node.checked = False
+    for node in checked_nodes(project, nodes):
+        node.checked = True
+
+
+def compact_project(project, nodes):
+    """Convert a project to the compact bitset encoding for its template"""
+    if "checked_bits" in project:
+        return project
+    _apply_project(project, nodes)
+    return _compact_data(project.get("template_file", ""), nodes)
+
+
+def expand_project(project, nodes):
+    """Convert a compact project back to IDs, or title paths if the template has no IDs"""
+    if "checked_bits" not in project:
+        return project
+    _apply_project(project, nodes)
+
+    expanded = {"template_file": project.get("template_file", "")}
+    if has_node_ids(nodes):
+        expanded["version"] = PROJECT_VERSION
+        expanded["checked_ids"] = sorted(get_checked_ids(nodes))
+    else:
+        expanded["checked_items"] = get_checked_paths(nodes)
+    return expanded
+
+
+def save_compact_project(file_path, template_path, nodes):
+    """Save the checked state of nodes as a compact project.
+
+    The hash is taken from the template file, so the bitset stays loadable.
+    Raises TemplateMismatch if nodes have been edited or moved since the
+    template was loaded, since their bits would not line up with the file.
+    """
+    template_nodes = nodes_from_sections(load_template_data(template_path).get("sections", []))
+    if template_hash(template_nodes) != template_hash(nodes):
+        raise TemplateMismatch("The scope tree no longer matches its template file.")
+    atomic_write_json(file_path, _compact_data(template_path, nodes), backups=DEFAULT_BACKUPS)
+
+
+def checked_nodes(project, nodes):
+    """Return the template nodes a project marks as checked"""
+    if "checked_bits" in project:
+        if project.get("template_hash") != template_hash(nodes):
+            raise TemplateMismatch("The template has changed since this project was saved.")
+        return decode_checked_bits(project["checked_bits"], nodes)
+    if "checked_ids" in project:
+        return match_checked_ids(nodes, project["checked_ids"])
+    return match_checked_paths(nodes, project.get("checked_items", []))
+
+
+def migrate_project(project, nodes):
+    """Upgrade a path-based project to node IDs, if its template has IDs.
+
+    Returns the upgraded project, or the original one when no upgrade applies.
+    """
+    if "checked_ids" in project or "checked_bits" in project or not has_node_ids(nodes):
+        return project
+    upgraded = {key: value for key, value in project.items() if key != "checked_items"}
+    upgraded["version"] = PROJECT_VERSION
+    upgraded["checked_ids"] = sorted(node.node_id for node in checked_nodes(project, nodes))
+    return upgraded
@@ -0,0 +1,247 @@
+# logic/scope_model.py
+
+from logic.template_cache import template_cache
+import json
+import os
+
+READ_CHUNK_SIZE = 1024 * 1024
+
+
+class LoadCancelled(Exception):
+    """Raised when a template load is cancelled part-way through."""
+
+
+class ScopeNode:
+    """A single scope item, independent of any Qt widget.
+
+    Nodes keep a parent pointer and their row within the parent so tree
+    models can map between nodes and positions in constant time. node_id is
+    the stable ID stored in the template (None until the template is saved).
+    """
+    __slots__ = ("title", "locked", "highlight", "checked", "node_id", "children", "parent", "row")
+
+    def __init__(self, title, locked=False, highlight=False, checked=False, children=None, node_id=None):
+        self.title = title
+        self.locked = locked
+        self.highlight = highlight
+        self.checked = checked
+        self.node_id = node_id
+        self.children = []
+        self.parent = None
+        self.row = 0
+        if children:
+            self.insert_children(0, children)
+
+    def __repr__(self):
+        return f"ScopeNode({self.title!r}, checked={self.checked}, children={len(self.children)})"
+
+    def insert_children(self, row, nodes):
+        self.children[row:row] = nodes
+        self._renumber(row)
+
+    def remove_children(self, row, count):
+        removed = self.children[row:row + count]
+        del self.children[row:row + count]
+        for node in removed:
+            node.parent = None
+        self._renumber(row)
+        return removed
+
+    def _renumber(self, start):
+        children = self.children
+        for i in range(start, len(children)):
+            children[i].parent = self
+            children[i].row = i
+
+
+def iter_nodes(nodes):
+    """Yield nodes and all their descendants in pre-order"""
+    stack = list(reversed(nodes))
+    while stack:
+        node = stack.pop()
+        yield node
+        stack.extend(reversed(node.children))
+
+
+def section_of(node):
+    """Return the top-level section a node belongs to"""
+    while node.parent is not None and node.parent.parent is not None:
+        node = node.parent
+    return node
+
+
+def load_template_data(file_path):
+    """Return parsed template JSON, reusing the cached copy if the file is unchanged"""
+    return template_cache.get(file_path)
+
+
+def read_template(file_path, progress=None, is_cancelled=None):
+    """Read, parse and build nodes for a template, with progress and cancellation.
+
+    progress receives a 0-100 percentage; is_cancelled is polled between
+    chunks and sections and raises LoadCancelled when it returns True.
+    Returns (template_data, nodes).
+    """
+    def check_cancelled():
+        if is_cancelled and is_cancelled():
+            raise LoadCancelled()
+
+    def report(percent):
+        if progress:
+            progress(percent)
+
+    # Reading and parsing covers the first half of the progress range
+    data = template_cache.lookup(file_path)
+    if data is None:
+        chunks = []
+        read = 0
+        with open(file_path, "rb") as f:
+            # The cache key describes the file actually read, even if it is
+            # replaced on disk while we read it
+            stat = os.fstat(f.fileno())
+            total = max(stat.st_size, 1)
+            while True:
+                check_cancelled()
+                chunk = f.read(READ_CHUNK_SIZE)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+                read += len(chunk)
+                report(min(read * 40 // total, 40))
+
+        data = json.loads(b"".join(chunks))
+        template_cache.store(file_path, data, stat)
+    report(50)
+
+    sections = data.get("sections", [])
+    nodes = []
+    for i, section in enumerate(sections):
+        check_cancelled()
+        nodes.extend(nodes_from_sections([section]))
+        report(50 + (i + 1) * 50 // len(sections))
+    if not sections:
+        report(100)
+    return data, nodes
+
+
+def resolve_template_path(template_file, project_path=None):
+    """Find a project's template, which may be stored relative to the project or data/"""
+    candidates = [template_file]
+    if project_path:
+        candidates.append(os.path.join(os.path.dirname(project_path), template_file))
+    candidates.append(os.path.join("data", template_file))
+    for candidate in candidates:
+        if os.path.exists(candidate):
+            return candidate
+    return template_file
+
+
+def nodes_from_sections(items):
+    """Build ScopeNodes from the "sections" list of a template"""
+    nodes = []
+    for item in items:
+        nodes.append(ScopeNode(
+            title=item.get("title", item.get("text", "Untitled")),
+            locked=item.get("locked", False),
+            highlight=item.get("highlight", False),
+            children=nodes_from_sections(item.get("children", [])),
+            node_id=item.get("id")
+        ))
+    return nodes
+
+
+def sections_from_nodes(nodes):
+    """Convert ScopeNodes back to the "sections" list of a template"""
+    items = []
+    for node in nodes:
+        item = {
+            "title": node.title,
+            "locked": node.locked,
+            "highlight": node.highlight
+        }
+        if node.node_id is not None:
+            item = {"id": node.node_id, **item}
+        children = sections_from_nodes(node.children)
+        if children:
+            item["children"] = children
+        items.append(item)
+    return items
+
+
+def assign_node_ids(nodes, next_id=None):
+    """Give every node without an ID a new one; returns the new next_id.
+
+    next_id is the template's stored high-water mark. IDs of deleted nodes
+    are below it, so they are never handed out again and old projects
+    cannot pick up new nodes. Templates saved before the mark existed start
+    above their highest live ID.
+    """
+    all_nodes = list(iter_nodes(nodes))
+    live_max = max((node.node_id for node in all_nodes if node.node_id is not None), default=0)
+    next_id = max(next_id or 1, live_max + 1)
+    for node in all_nodes:
+        if node.node_id is None:
+            node.node_id = next_id
+            next_id += 1
+    return next_id
+
+
+def has_node_ids(nodes):
+    return all(node.node_id is not None for node in iter_nodes(nodes))
+
+
+def match_checked_ids(nodes, ids):
+    """Return the nodes whose IDs are in ids"""
+    ids = set(ids)
+    return [node for node in iter_nodes(nodes) if node.node_id in ids]
+
+
+def get_checked_ids(nodes):
+    return [node.node_id for node in iter_nodes(nodes) if node.checked]
+
+
+def build_path_trie(paths):
+    """Index title paths as a trie of {title: [checked, children]}"""
+    trie = {}
+    for path in paths:
+        level = trie
+        entry = None
+        for title in path:
+            entry = level.setdefault(title, [False, {}])
+            level = entry[1]
+        if entry is not None:
+            entry[0] = True
+    return trie
+
+
+def match_checked_paths(nodes, paths):
+    """Return the nodes named by saved title paths"""
+    matches = []
+
+    def recurse(children, subtrie):
+        for node in children:
+            entry = subtrie.get(node.title)
+            if entry is None:
+                # No saved path goes through this node
+                continue
+            checked, grandchildren = entry
+            if checked:
+                matches.append(node)
+            if grandchildren:
+                recurse(node.children, grandchildren)
+
+    recurse(nodes, build_path_trie(paths))
+    return matches
+
+
+def get_checked_paths(nodes):
+    def recurse(children, path_so_far):
+        paths = []
+        for node in children:
+            current_path = path_so_far + [node.title]
+            if node.checked:
+                paths.append(current_path)
+            paths.extend(recurse(node.children, current_path))
+        return paths
+
+    return recurse(nodes, [])
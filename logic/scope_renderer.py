@@ -0,0 +1,509 @@
+# logic/scope_renderer.py
+
+"""Render scope nodes to scope text and HTML without Qt.
+
+Usage:
+    python -m logic.scope_renderer PROJECT.json [--format text|html] [--deep-numbering 1.|a.|i.|1.1.1] [-o OUTPUT]
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache, update_wrapper
+import argparse
+import re
+import sys
+
+from logic.atomic_write import atomic_write_text
+from logic.save_manager import checked_nodes, load_project
+from logic.scope_model import (
+    load_template_data, resolve_template_path, nodes_from_sections
+)
+
+DIVIDER_SECTIONS = {"MILESTONES", "ESTIMATED WORKFORCE", "CLARIFICATIONS", "SCOPE CLARIFICATIONS"}
+DIVIDER_LINE = "----------------------------------------"
+
+# Label schemes for items below level 2 (A. subsections hold 1. items);
+# "1.1.1" continues the parent's number as an outline (3.1., 3.1.2., ...)
+NUMBERING_SCHEMES = ("1.", "a.", "i.", "1.1.1")
+DEEP_NUMBERING = "1."
+
+# Parsed and formatted lines kept by the memoized HTML renderer, at least;
+# the caches grow to fit the largest scope rendered
+LINE_CACHE_SIZE = 16384
+
+LINE_HEIGHTS = {
+    "Single": "1.0",
+    "1.15": "1.15",
+    "1.5": "1.5",
+    "Double": "2.0"
+}
+
+
+class LineCache:
+    """Memoizes a per-line function with room for every line of a scope.
+
+    Scopes are re-rendered in the same order each time, which makes an LRU
+    smaller than the scope evict each line just before it is needed again.
+    Instead the cache grows with reserve() and is only cleared as a whole
+    once it is full.
+    """
+
+    def __init__(self, func, size=LINE_CACHE_SIZE):
+        update_wrapper(self, func)
+        self.func = func
+        self.size = size
+        self._cache = {}
+
+    def __call__(self, *args):
+        try:
+            return self._cache[args]
+        except KeyError:
+            pass
+        result = self.func(*args)
+        if len(self._cache) >= self.size:
+            self._cache.clear()
+        self._cache[args] = result
+        return result
+
+    def reserve(self, line_count):
+        # Room for the current and previous version of every line, so an
+        # edit or a style change does not push out lines that are still shown
+        self.size = max(self.size, 2 * line_count)
+
+    def cache_clear(self):
+        self._cache.clear()
+
+
+@dataclass
+class PreviewStyle:
+    """Formatting settings used when converting scope text to HTML."""
+    font_size: int = 11
+    indent_size: int = 20
+    line_height: str = "1.15"
+    numbering_style: str = "Professional"
+    professional: bool = True
+
+
+class ScopeLine:
+    """One line of rendered scope, kept structured for the HTML formatter.
+
+    kind is "blank", "divider", "heading" (a top-level section) or "item"
+    (a numbered/lettered scope item at level 1 and deeper).
+    """
+    __slots__ = ("kind", "level", "label", "text")
+
+    def __init__(self, kind, level=0, label="", text=""):
+        self.kind = kind
+        self.level = level
+        self.label = label
+        self.text = text
+
+    def __repr__(self):
+        return f"ScopeLine({self.kind!r}, {self.level}, {self.label!r}, {self.text!r})"
+
+    @property
+    def line(self):
+        """The line as it appears in the plain scope text"""
+        if self.kind == "item":
+            return f"{'    ' * (self.level - 1)}{self.label} {self.text}"
+        if self.kind == "heading":
+            return f"**{self.text}**"
+        if self.kind == "divider":
+            return DIVIDER_LINE
+        return ""
+
+
+BLANK_LINE = ScopeLine("blank")
+
+
+def lines_to_text(lines):
+    return "\n".join(record.line for record in lines)
+
+
+def render_scope_text(nodes, deep_numbering=DEEP_NUMBERING):
+    """Generate formatted scope text that matches PDF structure exactly"""
+    lines = []
+    for section in nodes:
+        lines.extend(render_section(section, deep_numbering))
+    return lines_to_text(lines)
+
+
+def render_section(section, deep_numbering=DEEP_NUMBERING):
+    """Render the ScopeLine records for a single top-level section"""
+    if not section.checked:
+        return []
+
+    # Top-level sections (SCOPE CLARIFICATIONS, ESTIMATED WORKFORCE, etc.)
+    lines = []
+    text_upper = section.title.strip().upper()
+    if any(divider in text_upper for divider in DIVIDER_SECTIONS):
+        lines.append(ScopeLine("divider"))
+    lines.append(ScopeLine("heading", text=text_upper))
+    lines.append(BLANK_LINE)
+    _render_children(section, 1, "", deep_numbering, lines)
+
+    # Clean up the output - remove excessive empty lines
+    cleaned_lines = []
+    prev_empty = False
+
+    for line in lines:
+        if line.kind != "blank":
+            cleaned_lines.append(line)
+            prev_empty = False
+        elif not prev_empty:  # Only add one empty line at a time
+            cleaned_lines.append(BLANK_LINE)
+            prev_empty = True
+
+    return cleaned_lines
+
+
+def _render_children(node, level, parent_label, deep_numbering, lines):
+    """Append records for node's checked children (and theirs) to lines.
+
+    Each call counts only its own children, so numbering restarts under
+    every parent and the whole section is rendered in a single pass.
+    """
+    counter = 0
+    for child in node.children:
+        if not child.checked:
+            continue
+        counter += 1
+
+        if level == 1:
+            # Subsections (A. Footings and Foundations, B. Slab-on-Grade, etc.)
+            label = f"{chr(ord('A') + counter - 1)}."
+        elif level == 2:
+            # Items under subsections (1., 2., 3., etc.)
+            label = f"{counter}."
+        else:
+            label = deep_label(counter, parent_label, deep_numbering)
+
+        lines.append(ScopeLine("item", level, label, child.title.strip()))
+        _render_children(child, level + 1, label, deep_numbering, lines)
+
+
+def deep_label(number, parent_label, scheme=DEEP_NUMBERING):
+    """Label of the number-th item below level 2 in a NUMBERING_SCHEMES scheme"""
+    if scheme == "a.":
+        return f"{_alphabetic(number)}."
+    if scheme == "i.":
+        return f"{_roman(number)}."
+    if scheme == "1.1.1":
+        return f"{parent_label}{number}."
+    return f"{number}."
+
+
+def _alphabetic(number):
+    # a..z, then aa, ab, ... like spreadsheet columns
+    letters = ""
+    while number > 0:
+        number, remainder = divmod(number - 1, 26)
+        letters = chr(ord('a') + remainder) + letters
+    return letters
+
+
+ROMAN_NUMERALS = (
+    (1000, "m"), (900, "cm"), (500, "d"), (400, "cd"), (100, "c"), (90, "xc"),
+    (50, "l"), (40, "xl"), (10, "x"), (9, "ix"), (5, "v"), (4, "iv"), (1, "i")
+)
+
+
+def _roman(number):
+    numeral = ""
+    for value, symbol in ROMAN_NUMERALS:
+        count, number = divmod(number, value)
+        numeral += symbol * count
+    return numeral
+
+
+def format_as_rich_text(text_data, style, lines=None):
+    """Convert plain text to rich HTML formatting with enhanced styling.
+
+    lines may be the ScopeLine records text_data was rendered from; they are
+    formatted directly instead of classifying each line of text again.
+    """
+    if not text_data.strip():
+        return ""
+
+    parsed = classify_lines(text_data, style.numbering_style, lines)
+    render_line.reserve(len(parsed))
+    html_content = []
+
+    font_size = style.font_size
+    indent_size = style.indent_size
+    line_height = style.line_height
+
+    # Professional document header
+    if style.professional:
+        html_content.append(f'''
+            <div style="text-align: center; margin-bottom: 25px; page-break-inside: avoid;">
+                <h1 style="font-size: {font_size + 3}pt; font-weight: bold; margin: 0; letter-spacing: 1px;">
+                    03-0000 CONCRETE SCOPE OF WORK
+                </h1>
+            </div>
+            ''')
+
+    # render_line is memoized, so unchanged lines are not re-formatted and a
+    # style change only re-renders from the already classified lines.
+    for kind, text in parsed:
+        html_content.append(render_line(kind, text, font_size, indent_size, line_height))
+
+    return ''.join(html_content)
+
+
+def classify_lines(text_data, numbering_style, lines=None):
+    """(kind, text) for every line, from the ScopeLine records if given"""
+    if lines is None:
+        text_lines = text_data.split('\n')
+        parse_line.reserve(len(text_lines))
+        return [parse_line(line, numbering_style) for line in text_lines]
+    return [classify_record(record, numbering_style) for record in lines]
+
+
+def classify_record(record, numbering_style):
+    """(kind, text) for render_line from a ScopeLine, without parsing its text"""
+    if record.kind == "blank":
+        return "blank", ""
+    if record.kind == "divider":
+        return "divider", ""
+    if record.kind == "item" and record.text:
+        kind = _label_kind(record.level, record.label, numbering_style)
+        if kind == "ordered":
+            return kind, record.text
+        return kind, f"{record.label} {record.text}"
+    # Headings and items with unusual (e.g. empty) titles take the text path
+    return parse_line(record.line, numbering_style)
+
+
+@lru_cache(maxsize=None)
+def _label_kind(level, label, numbering_style):
+    # Only the indent and label decide the kind, so there are few distinct keys
+    return _classify_item(f"{'    ' * (level - 1)}{label} x", numbering_style)[0]
+
+
+@LineCache
+def parse_line(line, numbering_style):
+    """Classify one line of free scope text as (kind, text) for render_line"""
+    stripped = line.strip()
+    if not stripped:
+        return "blank", ""
+
+    # Handle section dividers
+    if stripped.startswith('----') or stripped.startswith('****'):
+        return "divider", ""
+
+    # Main section headers (all caps, **bold**)
+    if stripped.startswith('**') and stripped.endswith('**'):
+        section_title = stripped[2:-2].strip()
+        return ("section" if section_title.isupper() else "bold"), section_title
+
+    # The line keeps its indent, which tells numbered items from subsections
+    return _classify_item(line.rstrip(), numbering_style)
+
+
+# Hierarchy patterns, matched at the start of a line
+LETTER_RE = re.compile(r'\s*[A-Z]\.\s+')
+INDENTED_NUMBER_RE = re.compile(r'\s+\d+\.\s+')
+SUB_NUMBER_RE = re.compile(r'\s*\d+(?:\.\d+)+\.\s+')
+BULLET_RE = re.compile(r'\s*[•*]\s+')
+NUMBER_RE = re.compile(r'\s*\d+\.\s+')
+ROMAN_RE = re.compile(r'\s*[IVX]+\.\s+')
+
+
+def _classify_item(line, style):
+    """Detect the hierarchy level of a numbered/lettered line for a numbering style"""
+    if style == "Professional":
+        if LETTER_RE.match(line):
+            # Subsection headers (A., B., C.)
+            return "subsection", line.strip()
+        elif INDENTED_NUMBER_RE.match(line):
+            # Numbered items under subsections
+            return "item", line.strip()
+        elif SUB_NUMBER_RE.match(line):
+            # Sub-numbered items (1.1., 1.2., 1.2.1., etc.)
+            return "subitem", line.strip()
+
+    elif style == "Standard Lists":
+        # Use bullet points and simple numbering
+        if BULLET_RE.match(line):
+            return "bullet", line.strip()[1:].strip()
+        match = NUMBER_RE.match(line)
+        if match:
+            return "ordered", line[match.end():].strip()
+
+    elif style == "Academic":
+        # Roman numerals, letters, numbers
+        if ROMAN_RE.match(line):
+            return "roman", line.strip()
+        elif LETTER_RE.match(line):
+            return "letter", line.strip()
+
+    return "text", line.strip()
+
+
+@LineCache
+def render_line(kind, text, font_size, indent_size, line_height):
+    """Return the HTML for one parsed line at the given style settings"""
+    if kind == "blank":
+        return '<br>'
+
+    if kind == "divider":
+        return '<hr style="border: none; border-bottom: 2px solid #333; margin: 20px 0 15px 0;">'
+
+    if kind == "section":
+        return '<hr style="border: none; border-bottom: 1px solid #333; margin: 15px 0 5px 0;">' + f'''
+                    <h2 style="font-size: {font_size + 1}pt; font-weight: bold; margin: 15px 0 12px 0;
+                              text-align: left; letter-spacing: 0.5px; line-height: {line_height};">
+                        {text}
+                    </h2>
+                    '''
+
+    if kind == "bold":
+        return f'<p style="font-weight: bold; margin: 10px 0; font-size: {font_size}pt;">{text}</p>'
+
+    if kind == "subsection":
+        return f'''
+                <p style="font-size: {font_size}pt; font-weight: bold; margin: 12px 0 8px 0;
+                         line-height: {line_height}; color: #000;">
+                    {text}
+                </p>
+                '''
+
+    if kind == "item":
+        return f'''
+                <p style="font-size: {font_size}pt; margin: 4px 0 4px {indent_size}px;
+                         line-height: {line_height}; text-align: justify;">
+                    {text}
+                </p>
+                '''
+
+    if kind == "subitem":
+        return f'''
+                <p style="font-size: {font_size}pt; margin: 3px 0 3px {indent_size * 2}px;
+                         line-height: {line_height}; text-align: justify;">
+                    {text}
+                </p>
+                '''
+
+    if kind == "bullet":
+        return f'''
+                <ul style="margin: 4px 0; padding-left: {indent_size}px;">
+                    <li style="font-size: {font_size}pt; line-height: {line_height};">
+                        {text}
+                    </li>
+                </ul>
+                '''
+
+    if kind == "ordered":
+        return f'''
+                <ol style="margin: 4px 0; padding-left: {indent_size}px;">
+                    <li style="font-size: {font_size}pt; line-height: {line_height};">
+                        {text}
+                    </li>
+                </ol>
+                '''
+
+    if kind == "roman":
+        return f'''
+                <p style="font-size: {font_size}pt; font-weight: bold; margin: 10px 0 6px 0;
+                         line-height: {line_height};">
+                    {text}
+                </p>
+                '''
+
+    if kind == "letter":
+        return f'''
+                <p style="font-size: {font_size}pt; margin: 6px 0 4px {indent_size}px;
+                         line-height: {line_height}; font-weight: 500;">
+                    {text}
+                </p>
+                '''
+
+    # Default formatting for regular text
+    return f'''
+        <p style="font-size: {font_size}pt; margin: 5px 0; line-height: {line_height};">
+            {text}
+        </p>
+        '''
+
+
+def format_as_html(text_data, style, lines=None):
+    """Format as clean HTML for export with enhanced styling"""
+    font_size = style.font_size
+    indent_size = style.indent_size
+    line_height = style.line_height
+
+    # Build CSS styles separately to avoid f-string backslash issues
+    body_style = f'body {{ font-family: Arial, sans-serif; font-size: {font_size}pt; line-height: {line_height}; margin: 1in; color: #000; }}'
+    h1_style = f'h1 {{ font-size: {font_size + 3}pt; text-align: center; margin-bottom: 25px; letter-spacing: 1px; }}'
+    h2_style = f'h2 {{ font-size: {font_size + 1}pt; margin: 15px 0 12px 0; letter-spacing: 0.5px; }}'
+    indent1_style = f'.indent-1 {{ margin-left: {indent_size}px; }}'
+    indent2_style = f'.indent-2 {{ margin-left: {indent_size * 2}px; }}'
+    indent3_style = f'.indent-3 {{ margin-left: {indent_size * 3}px; }}'
+
+    html = [
+        '<!DOCTYPE html>',
+        '<html>',
+        '<head>',
+        '<meta charset="UTF-8">',
+        '<title>Concrete Scope of Work</title>',
+        '<style>',
+        body_style,
+        h1_style,
+        h2_style,
+        'hr { border: none; border-bottom: 1px solid #333; margin: 15px 0 5px 0; }',
+        indent1_style,
+        indent2_style,
+        indent3_style,
+        '.subsection { font-weight: bold; margin: 12px 0 8px 0; }',
+        '.item { margin: 4px 0; text-align: justify; }',
+        'ul, ol { margin: 4px 0; padding-left: 20px; }',
+        'li { margin: 2px 0; }',
+        '@page { margin: 1in; }',
+        '@media print { body { margin: 0; } }',
+        '</style>',
+        '</head>',
+        '<body>'
+    ]
+
+    html.append(format_as_rich_text(text_data, style, lines))
+    html.extend(['</body>', '</html>'])
+    return ''.join(html)
+
+
+def render_project(template_data, project, output_format="text", style=None, deep_numbering=DEEP_NUMBERING):
+    """Render a template plus a saved project's checked items to scope text or HTML"""
+    nodes = nodes_from_sections(template_data.get("sections", []))
+    for node in checked_nodes(project, nodes):
+        node.checked = True
+    text = render_scope_text(nodes, deep_numbering)
+    if output_format == "html":
+        return format_as_html(text, style or PreviewStyle())
+    return text
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render a saved ScopeBuilder project.")
+    parser.add_argument("project", help="Saved project JSON file")
+    parser.add_argument("--template", help="Template JSON file (defaults to the project's template)")
+    parser.add_argument("--format", choices=["text", "html"], default="text")
+    parser.add_argument("--deep-numbering", choices=NUMBERING_SCHEMES, default=DEEP_NUMBERING,
+                        help="Label scheme for items nested below level 2")
+    parser.add_argument("-o", "--output", help="Output file (defaults to stdout)")
+    args = parser.parse_args(argv)
+
+    project = load_project(args.project)
+    if project is None:
+        parser.error(f"project not found: {args.project}")
+    template_path = args.template or resolve_template_path(project.get("template_file", ""), args.project)
+    template_data = load_template_data(template_path)
+
+    result = render_project(template_data, project, args.format, deep_numbering=args.deep_numbering)
+    if args.output:
+        atomic_write_text(args.output, result)
+    else:
+        sys.stdout.write(result + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
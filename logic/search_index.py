@@ -0,0 +1,298 @@
+# logic/search_index.py
+
+"""Full-text search over the scope item titles of every template in a folder.
+
+Usage:
+    python -m logic.search_index "vapor barrier" [--folder data] [-n 20]
+"""
+
+from bisect import bisect_left
+from dataclasses import dataclass
+import argparse
+import json
+import math
+import os
+import re
+import sys
+import threading
+
+from logic.atomic_write import atomic_write_json
+from logic.library_index import get_library_index
+
+INDEX_FILE_NAME = ".search_index"
+INDEX_VERSION = 1
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text):
+    return TOKEN_RE.findall(text.lower())
+
+
+def fuzzy_score(pattern, text):
+    """Score text against a lowercase pattern whose characters appear in order.
+
+    Returns None when text does not match. Substring matches outrank
+    scattered ones; runs of adjacent characters and word starts score higher.
+    """
+    if not pattern:
+        return 0
+    text = text.lower()
+    found = text.find(pattern)
+    if found != -1:
+        return 1000 - found
+
+    score = 0
+    prev = -2
+    pos = 0
+    for char in pattern:
+        pos = text.find(char, pos)
+        if pos == -1:
+            return None
+        if pos == prev + 1:
+            score += 5
+        elif pos == 0 or not text[pos - 1].isalnum():
+            score += 3
+        else:
+            score += 1
+        prev = pos
+        pos += 1
+    return score
+
+
+@dataclass
+class SearchResult:
+    """A scope item matching a query."""
+    template: str
+    path: list
+    score: float
+
+    @property
+    def title(self):
+        return self.path[-1]
+
+
+class TemplateSearchIndex:
+    """Inverted index from title words to (template, node) pairs.
+
+    Each template is indexed separately, so refresh() only re-reads files
+    whose mtime or size changed. The index is saved in the folder.
+    """
+    def __init__(self, folder_path):
+        self.folder_path = folder_path
+        self.index_path = os.path.join(folder_path, INDEX_FILE_NAME)
+        # name -> {"mtime", "size", "paths": [[titles]], "terms": {term: [node ids]}}
+        self._files = {}
+        # term -> {name: [node ids]}
+        self._postings = {}
+        self._node_count = 0
+        self._lock = threading.RLock()
+        self._load()
+
+    def refresh(self):
+        """Re-index templates that were added, changed or removed"""
+        if not os.path.isdir(self.folder_path):
+            return
+        with self._lock:
+            seen = set()
+            changed = False
+            with os.scandir(self.folder_path) as it:
+                for dir_entry in it:
+                    if not dir_entry.name.endswith(".json") or not dir_entry.is_file():
+                        continue
+                    seen.add(dir_entry.name)
+                    stat = dir_entry.stat()
+                    record = self._files.get(dir_entry.name)
+                    if record is None or record["mtime"] != stat.st_mtime or record["size"] != stat.st_size:
+                        self._index_file(dir_entry.path, stat.st_mtime, stat.st_size)
+                        changed = True
+
+            for name in set(self._files) - seen:
+                self._remove_file(name)
+                changed = True
+
+            if changed:
+                self._save()
+
+    def search(self, query, limit=50):
+        """Return the best matching nodes containing every word of query"""
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            return []
+
+        with self._lock:
+            postings = [self._postings.get(token) for token in tokens]
+            if not all(postings):
+                return []
+
+            # idf weights rare words higher; df counts matching nodes
+            weights = [
+                math.log(1 + self._node_count / sum(len(ids) for ids in by_file.values()))
+                for by_file in postings
+            ]
+            phrase = " ".join(tokens)
+
+            results = []
+            rarest = min(postings, key=len)
+            for name in rarest:
+                node_ids = None
+                for by_file in postings:
+                    ids = by_file.get(name)
+                    if ids is None:
+                        node_ids = None
+                        break
+                    node_ids = set(ids) if node_ids is None else node_ids.intersection(ids)
+                    if not node_ids:
+                        break
+                if not node_ids:
+                    continue
+
+                paths = self._files[name]["paths"]
+                for node_id in node_ids:
+                    path = paths[node_id]
+                    score = sum(weights)
+                    if len(tokens) > 1 and phrase in " ".join(tokenize(path[-1])):
+                        score *= 2
+                    results.append(SearchResult(name, path, score))
+
+        results.sort(key=lambda r: (-r.score, len(r.title), r.template, r.path))
+        return results[:limit]
+
+    def _index_file(self, file_path, mtime, size):
+        name = os.path.basename(file_path)
+        try:
+            with open(file_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+        sections = data.get("sections", []) if isinstance(data, dict) else []
+
+        paths = []
+        terms = {}
+
+        def walk(items, parent_path):
+            for item in items:
+                path = parent_path + [item.get("title", item.get("text", "Untitled"))]
+                node_id = len(paths)
+                paths.append(path)
+                for term in set(tokenize(path[-1])):
+                    terms.setdefault(term, []).append(node_id)
+                walk(item.get("children", []), path)
+
+        walk(sections, [])
+
+        self._remove_file(name)
+        self._add_record(name, {"mtime": mtime, "size": size, "paths": paths, "terms": terms})
+
+    def _add_record(self, name, record):
+        self._files[name] = record
+        self._node_count += len(record["paths"])
+        for term, node_ids in record["terms"].items():
+            self._postings.setdefault(term, {})[name] = node_ids
+
+    def _remove_file(self, name):
+        record = self._files.pop(name, None)
+        if record is None:
+            return
+        self._node_count -= len(record["paths"])
+        for term in record["terms"]:
+            by_file = self._postings.get(term)
+            if by_file is not None:
+                by_file.pop(name, None)
+                if not by_file:
+                    del self._postings[term]
+
+    def _load(self):
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return
+        if not isinstance(stored, dict) or stored.get("version") != INDEX_VERSION:
+            return
+        for name, record in stored.get("files", {}).items():
+            self._add_record(name, record)
+
+    def _save(self):
+        try:
+            atomic_write_json(self.index_path, {"version": INDEX_VERSION, "files": self._files})
+        except OSError:
+            # The index is only a cache; it is rebuilt on the next refresh
+            pass
+
+
+class NodeTitleIndex:
+    """Word index over the titles of one loaded scope tree.
+
+    Nodes are numbered in pre-order so matches come back in tree order.
+    The last query word matches as a prefix, for search-as-you-type.
+    """
+    def __init__(self, nodes):
+        self.nodes = []
+        self._postings = {}
+        stack = list(reversed(nodes))
+        while stack:
+            node = stack.pop()
+            position = len(self.nodes)
+            self.nodes.append(node)
+            for term in set(tokenize(node.title)):
+                self._postings.setdefault(term, []).append(position)
+            stack.extend(reversed(node.children))
+        self._terms = sorted(self._postings)
+
+    def find(self, query):
+        """Return nodes whose titles contain every word of query, in tree order"""
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        *words, prefix = tokens
+
+        positions = None
+        for word in words:
+            ids = self._postings.get(word)
+            if not ids:
+                return []
+            positions = set(ids) if positions is None else positions.intersection(ids)
+
+        prefixed = set()
+        for i in range(bisect_left(self._terms, prefix), len(self._terms)):
+            term = self._terms[i]
+            if not term.startswith(prefix):
+                break
+            prefixed.update(self._postings[term])
+        positions = prefixed if positions is None else positions & prefixed
+
+        return [self.nodes[position] for position in sorted(positions)]
+
+
+_indexes = {}
+
+
+def get_search_index(folder_path):
+    """Return the shared search index for a folder, kept current via its library index"""
+    key = os.path.abspath(folder_path)
+    index = _indexes.get(key)
+    if index is None:
+        index = TemplateSearchIndex(folder_path)
+        index.refresh()
+        get_library_index(folder_path).add_listener(index.refresh)
+        _indexes[key] = index
+    return index
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Search scope items across all templates.")
+    parser.add_argument("query", help="Words to search for")
+    parser.add_argument("--folder", default="data", help="Template folder")
+    parser.add_argument("-n", "--limit", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    index = TemplateSearchIndex(args.folder)
+    index.refresh()
+    for result in index.search(args.query, args.limit):
+        print(f"{result.score:6.2f}  {result.template}: {' > '.join(result.path)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+# logic/template_cache.py
+
+from collections import OrderedDict
+import json
+import os
+import threading
+
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024
+
+
+class TemplateCache:
+    """LRU cache of parsed template JSON keyed by (absolute path, mtime, size).
+
+    An entry is reused only while the file's mtime and size are unchanged.
+    The byte budget is measured in template file bytes, and the least recently
+    used entries are evicted once it is exceeded. Cached data is shared
+    between callers and must not be mutated.
+    """
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # abspath -> (mtime_ns, size, data)
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def _stat_key(self, file_path, stat=None):
+        if stat is None:
+            stat = os.stat(file_path)
+        return os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size
+
+    def lookup(self, file_path):
+        """Return cached data for an unchanged file, or None"""
+        path, mtime, size = self._stat_key(file_path)
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is None or entry[:2] != (mtime, size):
+                return None
+            self._entries.move_to_end(path)
+            return entry[2]
+
+    def store(self, file_path, data, stat):
+        """Cache data parsed from file_path.
+
+        stat must come from os.fstat on the file the data was read from; a
+        fresh stat could describe a newer file that replaced it meanwhile.
+        """
+        path, mtime, size = self._stat_key(file_path, stat)
+        with self._lock:
+            old = self._entries.pop(path, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[path] = (mtime, size, data)
+            self._bytes += size
+            self._evict()
+
+    def get(self, file_path):
+        """Return parsed data for file_path, loading and caching it on a miss"""
+        data = self.lookup(file_path)
+        if data is None:
+            with open(file_path, "r", encoding="utf-8") as f:
+                stat = os.fstat(f.fileno())
+                data = json.load(f)
+            self.store(file_path, data, stat)
+        return data
+
+    def set_max_bytes(self, max_bytes):
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def memory_usage(self):
+        return self._bytes
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _evict(self):
+        # The most recent entry is always kept, even if it alone exceeds the budget
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            _, (_, size, _) = self._entries.popitem(last=False)
+            self._bytes -= size
+
+
+# Global instance
+template_cache = TemplateCache()
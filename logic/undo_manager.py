@@ -1,33 +1,81 @@
 # logic/undo_manager.py
 
+from collections import deque
+
 from logic.undo_redo import Command
 
+DEFAULT_MAX_ENTRIES = 500
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
 
 class UndoManager:
-    def __init__(self):
-        self.stack = []
-        self.redo_stack = []
+    """Undo/redo history bounded by entry count and estimated memory use.
+
+    The oldest entries are evicted once either limit is exceeded, and
+    consecutive commands sharing a merge_key are coalesced into one entry.
+    """
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES):
+        self.stack = deque()
+        self.redo_stack = deque()
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._stack_bytes = 0
+        self._redo_bytes = 0
+
+    def set_limits(self, max_entries=None, max_bytes=None):
+        if max_entries is not None:
+            self.max_entries = max_entries
+        if max_bytes is not None:
+            self.max_bytes = max_bytes
+        self._enforce_limits()
 
     def push(self, command: Command):
         command.do()
-        self.stack.append(command)
         self.redo_stack.clear()
+        self._redo_bytes = 0
+
+        top = self.stack[-1] if self.stack else None
+        previous_size = top.size if top else 0
+        if top is not None and top.merge(command):
+            self._stack_bytes += top.size - previous_size
+        else:
+            self.stack.append(command)
+            self._stack_bytes += command.size
+        self._enforce_limits()
 
     def undo(self):
         if self.stack:
             command = self.stack.pop()
+            self._stack_bytes -= command.size
             command.undo()
             self.redo_stack.append(command)
+            self._redo_bytes += command.size
 
     def redo(self):
         if self.redo_stack:
             command = self.redo_stack.pop()
+            self._redo_bytes -= command.size
             command.do()
             self.stack.append(command)
+            self._stack_bytes += command.size
 
     def clear(self):
         self.stack.clear()
         self.redo_stack.clear()
+        self._stack_bytes = 0
+        self._redo_bytes = 0
+
+    def memory_usage(self):
+        """Estimated bytes held by the undo and redo history"""
+        return self._stack_bytes + self._redo_bytes
+
+    def _enforce_limits(self):
+        while self.stack and (
+            len(self.stack) > self.max_entries
+            or (self.memory_usage() > self.max_bytes and len(self.stack) > 1)
+        ):
+            evicted = self.stack.popleft()
+            self._stack_bytes -= evicted.size
 
 
 # Global instance
@@ -1,11 +1,25 @@
 # logic/undo_redo.py
 
+import sys
+
+
+def estimate_size(*values):
+    """Rough in-memory size of the values a command keeps alive"""
+    return sum(sys.getsizeof(value) for value in values)
+
+
 class Command:
-    """A reversible command with do and undo functions."""
-    def __init__(self, do_func, undo_func, description=""):
+    """A reversible command with do and undo functions.
+
+    size is the estimated number of bytes the command keeps alive. Consecutive
+    commands with the same non-None merge_key are coalesced into one entry.
+    """
+    def __init__(self, do_func, undo_func, description="", size=0, merge_key=None):
         self.do_func = do_func
         self.undo_func = undo_func
         self.description = description
+        self.size = size
+        self.merge_key = merge_key
 
     def do(self):
         self.do_func()
@@ -13,6 +27,88 @@ class Command:
     def undo(self):
         self.undo_func()
 
+    def merge(self, other):
+        """Absorb a following command, keeping this command's undo state"""
+        if self.merge_key is None or self.merge_key != other.merge_key:
+            return False
+        self.do_func = other.do_func
+        # The merged entry holds one snapshot from each command
+        self.size = max(self.size, other.size)
+        return True
+
+
+class LineDelta:
+    """The run of lines that differs between two versions of a text."""
+    __slots__ = ("start", "old_lines", "new_lines")
+
+    def __init__(self, start, old_lines, new_lines):
+        self.start = start
+        self.old_lines = old_lines
+        self.new_lines = new_lines
+
+    @classmethod
+    def between(cls, old_text, new_text):
+        old = old_text.split("\n")
+        new = new_text.split("\n")
+        limit = min(len(old), len(new))
+
+        prefix = 0
+        while prefix < limit and old[prefix] == new[prefix]:
+            prefix += 1
+        suffix = 0
+        while suffix < limit - prefix and old[-1 - suffix] == new[-1 - suffix]:
+            suffix += 1
+
+        return cls(prefix, old[prefix:len(old) - suffix], new[prefix:len(new) - suffix])
+
+    def is_empty(self):
+        return self.old_lines == self.new_lines
+
+    def apply(self, text):
+        return self._replace(text, self.old_lines, self.new_lines)
+
+    def revert(self, text):
+        return self._replace(text, self.new_lines, self.old_lines)
+
+    def _replace(self, text, removed, inserted):
+        lines = text.split("\n")
+        lines[self.start:self.start + len(removed)] = inserted
+        return "\n".join(lines)
+
+    @property
+    def size(self):
+        return estimate_size(self, self.old_lines, self.new_lines, *self.old_lines, *self.new_lines)
+
+
+class LineDeltaCommand(Command):
+    """A text change stored as a LineDelta rather than full before/after copies.
+
+    get_text/set_text read and replace the source text; anything derived from
+    it (e.g. rendered HTML) is rebuilt by set_text on demand.
+    """
+    def __init__(self, get_text, set_text, delta, description="", merge_key=None):
+        self.get_text = get_text
+        self.set_text = set_text
+        self.delta = delta
+        super().__init__(self._apply, self._revert, description, delta.size, merge_key)
+
+    def _apply(self):
+        self.set_text(self.delta.apply(self.get_text()))
+
+    def _revert(self):
+        self.set_text(self.delta.revert(self.get_text()))
+
+    def merge(self, other):
+        if (not isinstance(other, LineDeltaCommand) or self.merge_key is None
+                or self.merge_key != other.merge_key):
+            return False
+        # other has already been applied, so compose both deltas from the current text
+        current = self.get_text()
+        original = self.delta.revert(other.delta.revert(current))
+        self.delta = LineDelta.between(original, current)
+        self.size = self.delta.size
+        return True
+
 
 class UndoRedoStack:
     """Maintains undo/redo history using stacks."""
@@ -0,0 +1,76 @@
+from PyQt6.QtCore import QObject
+from logic.autosave import (
+    JOURNAL_FILE, JournalError, JournalWriter, insert_record, is_attached, read_journal, remove_record,
+    saved_record, set_record, start_record
+)
+
+
+class Autosave(QObject):
+    """Journals every edit of a ScopeTreeWidget for crash recovery.
+
+    Records are built on the GUI thread (a row path and a few fields) and
+    handed to a JournalWriter, which batches and writes them on its own thread.
+    """
+    def __init__(self, scope_tree, journal_path=JOURNAL_FILE, parent=None):
+        super().__init__(parent)
+        self.scope_tree = scope_tree
+        self.journal_path = journal_path
+        self.writer = JournalWriter(journal_path)
+
+        scope_tree.templateLoaded.connect(self.on_template_loaded)
+        scope_tree.nodesEdited.connect(self.on_nodes_edited)
+        scope_tree.model.nodesInserted.connect(self.on_nodes_inserted)
+        scope_tree.model.nodesRemoved.connect(self.on_nodes_removed)
+
+    def on_template_loaded(self, template_path):
+        self.writer.reset([start_record(template_path)])
+
+    def on_nodes_edited(self, changes):
+        root = self.scope_tree.model.root
+        for node, attribute, value in changes:
+            # Undo can still edit nodes that have been removed from the tree;
+            # their row paths would point at unrelated live nodes
+            if is_attached(node, root):
+                self.writer.append(set_record(node, attribute, value))
+
+    def on_nodes_inserted(self, parent, row, nodes):
+        self.writer.append(insert_record(parent, row, nodes))
+
+    def on_nodes_removed(self, parent, row, count):
+        self.writer.append(remove_record(parent, row, count))
+
+    def mark_saved(self, project_path):
+        self.writer.append(saved_record(project_path))
+
+    def unsaved_work(self):
+        """(template_path, records) left by a session that did not exit cleanly, or None"""
+        return read_journal(self.journal_path)
+
+    def recover(self, template_path, records, on_recovered=None):
+        """Reload the journal's template and replay its records.
+
+        on_recovered is called with None, or an error message if only part
+        of the journal could be replayed.
+        """
+        def replay():
+            error = None
+            applied = len(records)
+            try:
+                self.scope_tree.apply_journal(records)
+            except JournalError as e:
+                error, applied = str(e), e.applied
+            # Replayed records belong to this session's journal too
+            for record in records[:applied]:
+                self.writer.append(record)
+            if on_recovered:
+                on_recovered(error)
+
+        self.scope_tree.load_template(template_path, on_loaded=replay)
+
+    def discard(self):
+        self.writer.discard()
+
+    def close(self):
+        """Finish pending writes and remove the journal (a clean exit)"""
+        self.writer.discard()
+        self.writer.close()
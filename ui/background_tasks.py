@@ -0,0 +1,98 @@
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+import threading
+
+from logic.scope_model import LoadCancelled, read_template
+
+
+class TemplateLoadSignals(QObject):
+    progress = pyqtSignal(int)
+    finished = pyqtSignal(object, object)  # (template data, ScopeNodes)
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+
+class TemplateLoadTask(QRunnable):
+    """Reads and parses a template on a QThreadPool worker thread."""
+
+    def __init__(self, file_path):
+        super().__init__()
+        self.file_path = file_path
+        self.signals = TemplateLoadSignals()
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        self._cancel_event.set()
+
+    def is_cancelled(self):
+        return self._cancel_event.is_set()
+
+    def run(self):
+        try:
+            data, nodes = read_template(
+                self.file_path,
+                progress=self.signals.progress.emit,
+                is_cancelled=self.is_cancelled
+            )
+        except LoadCancelled:
+            self.signals.cancelled.emit()
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+        else:
+            self.signals.finished.emit(data, nodes)
+
+
+class PreviewRenderSignals(QObject):
+    finished = pyqtSignal(int, str)  # (generation, HTML)
+    failed = pyqtSignal(int, str)
+
+
+class PreviewRenderTask(QRunnable):
+    """Builds preview HTML from a snapshot of the scope on a worker thread.
+
+    render is scope_renderer.format_as_rich_text or format_as_html; its
+    arguments (text, PreviewStyle, ScopeLine records) are not modified
+    after the snapshot, so no locking is needed.
+    """
+
+    def __init__(self, generation, render, *args):
+        super().__init__()
+        self.generation = generation
+        self.render = render
+        self.args = args
+        self.signals = PreviewRenderSignals()
+
+    def run(self):
+        try:
+            content = self.render(*self.args)
+        except Exception as e:
+            self.signals.failed.emit(self.generation, str(e))
+        else:
+            self.signals.finished.emit(self.generation, content)
+
+
+class LibraryIndexNotifier(QObject):
+    """Re-emits LibraryIndex change callbacks as a Qt signal.
+
+    Index changes are reported on the watchdog thread; connecting to
+    changed delivers them on the receiver's (GUI) thread.
+    """
+    changed = pyqtSignal()
+
+    def __init__(self, index, parent=None):
+        super().__init__(parent)
+        self.index = index
+        # Every self.changed access is a new bound signal, so the same emit
+        # object must be kept for remove_listener to find it
+        self._callback = self.changed.emit
+        self._attached = False
+        self.attach()
+
+    def attach(self):
+        if not self._attached:
+            self.index.add_listener(self._callback)
+            self._attached = True
+
+    def detach(self):
+        if self._attached:
+            self.index.remove_listener(self._callback)
+            self._attached = False
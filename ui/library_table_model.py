@@ -0,0 +1,113 @@
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, QSortFilterProxyModel
+from logic.search_index import fuzzy_score
+from datetime import datetime
+
+SORT_ROLE = Qt.ItemDataRole.UserRole
+
+# Typing pause before the browsers re-filter
+FILTER_DELAY_MS = 150
+
+NAME_COLUMN = 0
+COLUMNS = ["Name", "Template", "Sections", "Items", "Last Modified", "Size"]
+
+
+def format_size(size):
+    if size < 1024:
+        return f"{size} B"
+    if size < 1024 * 1024:
+        return f"{size / 1024:.1f} KB"
+    return f"{size / (1024 * 1024):.1f} MB"
+
+
+class LibraryTableModel(QAbstractTableModel):
+    """Table of LibraryEntry summaries for the template and project browsers"""
+    def __init__(self, name_header="Name", parent=None):
+        super().__init__(parent)
+        self.headers = [name_header] + COLUMNS[1:]
+        self.entries = []
+
+    def set_entries(self, entries):
+        self.beginResetModel()
+        self.entries = list(entries)
+        self.endResetModel()
+
+    def entry_at(self, row):
+        return self.entries[row]
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.entries)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.headers[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        entry = self.entries[index.row()]
+        column = index.column()
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == 0:
+                return entry.name
+            if column == 1:
+                return entry.template_name
+            if column == 2:
+                return str(entry.section_count)
+            if column == 3:
+                return str(entry.item_count)
+            if column == 4:
+                return datetime.fromtimestamp(entry.mtime).strftime("%Y-%m-%d %H:%M")
+            if column == 5:
+                return format_size(entry.size)
+
+        # Raw values so numbers and dates sort numerically
+        if role == SORT_ROLE:
+            return (
+                entry.name.lower(),
+                entry.template_name.lower(),
+                entry.section_count,
+                entry.item_count,
+                entry.mtime,
+                entry.size
+            )[column]
+
+        return None
+
+
+class LibraryFilterProxyModel(QSortFilterProxyModel):
+    """Sorts library entries and fuzzy-filters them by name.
+
+    Entries listed in extra_matches are shown regardless of their name,
+    with the matched text as the name's tooltip.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setSortRole(SORT_ROLE)
+        self.setDynamicSortFilter(True)
+        self._pattern = ""
+        self._extra_matches = {}
+
+    def set_pattern(self, text, extra_matches=None):
+        self._pattern = text.strip().lower()
+        self._extra_matches = extra_matches or {}
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if not self._pattern:
+            return True
+        name = self.sourceModel().entry_at(source_row).name
+        return name in self._extra_matches or fuzzy_score(self._pattern, name) is not None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.ToolTipRole and index.column() == NAME_COLUMN:
+            name = self.sourceModel().entry_at(self.mapToSource(index).row()).name
+            return self._extra_matches.get(name)
+        return super().data(index, role)
+
+    def entry_for(self, proxy_index):
+        return self.sourceModel().entry_at(self.mapToSource(proxy_index).row())
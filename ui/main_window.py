@@ -3,8 +3,9 @@ from PyQt6.QtWidgets import (
     QPushButton, QSplitter, QFileDialog, QMessageBox
 )
 from PyQt6.QtGui import QKeySequence, QShortcut
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QTimer
 
+from ui.autosave import Autosave
 from ui.scope_tree_widget import ScopeTreeWidget
 from ui.scope_preview_panel import ScopePreviewPanel
 from ui.template_editor_dialog import TemplateEditorDialog
@@ -12,7 +13,8 @@ from ui.new_template_dialog import NewTemplateDialog
 from ui.project_loader_window import ProjectLoaderWindow
 from ui.template_loader_window import TemplateLoaderWindow
 
-from logic.save_manager import save_project, load_project
+from logic.atomic_write import atomic_write_text
+from logic.save_manager import TemplateMismatch, save_compact_project, save_project, load_project
 from logic.undo_manager import undo_manager
 import os
 
@@ -73,7 +75,8 @@ class MainWindow(QMainWindow):
         self.scope_tree = ScopeTreeWidget()
         self.preview_panel = ScopePreviewPanel()
 
-        self.scope_tree.scopeChanged.connect(self.preview_panel.update_preview)
+        self.scope_tree.scopeLinesChanged.connect(self.preview_panel.update_preview_lines)
+        self.preview_panel.deepNumberingChanged.connect(self.scope_tree.set_deep_numbering)
 
         splitter.addWidget(self.scope_tree)
         splitter.addWidget(self.preview_panel)
@@ -82,10 +85,40 @@ class MainWindow(QMainWindow):
 
         main_layout.addWidget(splitter)
 
+        # Journal edits in the background so a crash loses nothing
+        self.autosave = Autosave(self.scope_tree, parent=self)
+        QTimer.singleShot(0, self.offer_recovery)
+
         # Global Undo/Redo keyboard shortcuts
         QShortcut(QKeySequence("Ctrl+Z"), self).activated.connect(self.undo_action)
         QShortcut(QKeySequence("Ctrl+Y"), self).activated.connect(self.redo_action)
 
+    def offer_recovery(self):
+        unsaved = self.autosave.unsaved_work()
+        if unsaved is None:
+            return
+        template_path, records = unsaved
+        confirm = QMessageBox.question(
+            self,
+            "Recover Unsaved Work",
+            f"ScopeBuilder did not close properly. Recover {len(records)} unsaved change(s) to "
+            f"{os.path.basename(template_path)}?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        if confirm != QMessageBox.StandardButton.Yes:
+            self.autosave.discard()
+            return
+
+        def recovered(error):
+            if error:
+                QMessageBox.warning(self, "Recovery Incomplete", error)
+
+        self.autosave.recover(template_path, records, on_recovered=recovered)
+
+    def closeEvent(self, event):
+        self.autosave.close()
+        super().closeEvent(event)
+
     def undo_action(self):
         undo_manager.undo()
 
@@ -100,9 +133,11 @@ class MainWindow(QMainWindow):
             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
         )
         if confirm == QMessageBox.StandardButton.Yes:
-            self.scope_tree.tree.clear()
+            self.scope_tree.clear()
             self.scope_tree.label.setText("Scope Tree")
             self.preview_panel.clear()
+            undo_manager.clear()
+            self.autosave.discard()
 
     def new_template(self):
         dialog = NewTemplateDialog(templates_folder="data", parent=self)
@@ -131,26 +166,45 @@ class MainWindow(QMainWindow):
         )
         if file_path:
             try:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(text)
+                atomic_write_text(file_path, text)
                 QMessageBox.information(self, "Export", "Scope successfully exported.")
             except Exception as e:
                 QMessageBox.critical(self, "Export Error", str(e))
 
     def save_project(self):
-        file_path, _ = QFileDialog.getSaveFileName(
-            self, "Save Project", "data/saved_projects/", "JSON Files (*.json)"
+        file_path, selected_filter = QFileDialog.getSaveFileName(
+            self, "Save Project", "data/saved_projects/",
+            "JSON Files (*.json);;Compact Project (*.json)"
         )
         if not file_path:
             return
 
-        template_path = self.scope_tree.label.text().replace("Loaded: ", "").strip()
+        template_path = self.scope_tree.template_path
         if not template_path or not os.path.exists(template_path):
             QMessageBox.warning(self, "Template Missing", "Please load a template first.")
             return
 
-        checked_paths = self.scope_tree.get_checked_paths()
-        save_project(file_path, template_path, checked_paths)
+        compact_saved = False
+        if selected_filter.startswith("Compact"):
+            # Bitset over the template's nodes; only valid for this exact template
+            try:
+                save_compact_project(file_path, template_path, self.scope_tree.model.root.children)
+                compact_saved = True
+            except TemplateMismatch:
+                QMessageBox.information(
+                    self, "Compact Save Unavailable",
+                    "The scope tree has been edited since the template was loaded, "
+                    "so the project will be saved in the regular format."
+                )
+
+        if not compact_saved:
+            checked_ids = self.scope_tree.get_checked_ids()
+            if checked_ids is not None:
+                save_project(file_path, template_path, checked_ids=checked_ids)
+            else:
+                # Templates get node IDs the first time they are saved in the editor
+                save_project(file_path, template_path, checked_paths=self.scope_tree.get_checked_paths())
+        self.autosave.mark_saved(file_path)
         QMessageBox.information(self, "Saved", "Project saved successfully.")
 
     def load_project(self):
@@ -161,10 +215,15 @@ class MainWindow(QMainWindow):
                 return
 
             template_path = project_data.get("template_file")
-            checked_paths = project_data.get("checked_items", [])
 
-            self.scope_tree.load_template(template_path)
-            self.scope_tree.set_checked_paths(checked_paths)
+            def restore():
+                try:
+                    self.scope_tree.restore_project(project_data)
+                except ValueError as e:
+                    # TemplateMismatch, or a project file with damaged contents
+                    QMessageBox.warning(self, "Template Changed", str(e))
+
+            self.scope_tree.load_template(template_path, on_loaded=restore)
 
         dialog = ProjectLoaderWindow("data/saved_projects", load_project_data, self)
         dialog.exec()
@@ -2,6 +2,7 @@ from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QLabel, QLineEdit,
     QPushButton, QHBoxLayout, QMessageBox
 )
+from logic.atomic_write import atomic_write_json
 import os
 
 
@@ -51,7 +52,10 @@ class NewTemplateDialog(QDialog):
             return
 
         # Save empty structure
+        try:
+            atomic_write_json(path, {"template_name": name, "sections": []}, indent=2)
+        except OSError as e:
+            QMessageBox.critical(self, "Error", f"Failed to create template:\n{str(e)}")
+            return
         self.template_path = path
-        with open(path, "w", encoding="utf-8") as f:
-            f.write('{\n  "template_name": "' + name + '",\n  "sections": []\n}')
         self.accept()
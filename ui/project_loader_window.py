@@ -1,11 +1,13 @@
 from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QLineEdit,
-    QTableWidget, QTableWidgetItem, QPushButton,
+    QTableView, QPushButton,
     QFileDialog, QMessageBox, QHeaderView
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QTimer
+from logic.library_index import get_library_index
+from ui.background_tasks import LibraryIndexNotifier
+from ui.library_table_model import FILTER_DELAY_MS, LibraryFilterProxyModel, LibraryTableModel
 import os
-from datetime import datetime
 
 
 class ProjectLoaderWindow(QDialog):
@@ -16,21 +18,41 @@ class ProjectLoaderWindow(QDialog):
         self.folder_path = folder_path
         self.load_callback = load_callback
 
+        # Shared index of the folder, kept current by a watchdog observer
+        self.library_index = get_library_index(folder_path)
+        self.index_notifier = LibraryIndexNotifier(self.library_index, self)
+        self.index_notifier.changed.connect(self.populate_projects)
+
         self.layout = QVBoxLayout(self)
 
         # Search bar
         search_layout = QHBoxLayout()
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("Filter saved projects...")
-        self.search_input.textChanged.connect(self.filter_projects)
         search_layout.addWidget(self.search_input)
         self.layout.addLayout(search_layout)
 
+        # Filter once typing pauses rather than on every keystroke
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(FILTER_DELAY_MS)
+        self.filter_timer.timeout.connect(lambda: self.filter_projects(self.search_input.text()))
+        self.search_input.textChanged.connect(self.filter_timer.start)
+
         # Table of projects
-        self.table = QTableWidget(0, 2)
-        self.table.setHorizontalHeaderLabels(["Project Name", "Last Modified"])
+        self.model = LibraryTableModel("Project Name", self)
+        self.proxy = LibraryFilterProxyModel(self)
+        self.proxy.setSourceModel(self.model)
+
+        self.table = QTableView()
+        self.table.setModel(self.proxy)
+        self.table.setSortingEnabled(True)
+        self.table.sortByColumn(0, Qt.SortOrder.AscendingOrder)
+        self.table.verticalHeader().hide()
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
-        self.table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        self.table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        self.table.setSelectionMode(QTableView.SelectionMode.SingleSelection)
+        self.table.doubleClicked.connect(lambda index: self.load_selected_project())
         self.layout.addWidget(self.table)
 
         # Button row
@@ -51,41 +73,31 @@ class ProjectLoaderWindow(QDialog):
 
         self.layout.addLayout(button_layout)
 
-        # Load table entries
-        self.populate_projects()
-
     def populate_projects(self):
-        self.table.setRowCount(0)
-        if not os.path.exists(self.folder_path):
-            os.makedirs(self.folder_path)
-
-        for file in sorted(os.listdir(self.folder_path)):
-            if file.endswith(".json"):
-                full_path = os.path.join(self.folder_path, file)
-                row = self.table.rowCount()
-                self.table.insertRow(row)
+        # The proxy keeps the current filter and sort applied across resets
+        self.model.set_entries(self.library_index.entries())
 
-                self.table.setItem(row, 0, QTableWidgetItem(file))
-                self.table.setItem(row, 1, QTableWidgetItem(
-                    self.format_date(os.path.getmtime(full_path)))
-                )
+    def showEvent(self, event):
+        super().showEvent(event)
+        # The index stays current while hidden; only the table needs refreshing
+        self.index_notifier.attach()
+        self.populate_projects()
 
-    def format_date(self, timestamp):
-        return datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M")
+    def hideEvent(self, event):
+        # Stop live updates while the window is not visible
+        self.index_notifier.detach()
+        super().hideEvent(event)
 
     def filter_projects(self, text):
-        for row in range(self.table.rowCount()):
-            item = self.table.item(row, 0)
-            visible = text.lower() in item.text().lower()
-            self.table.setRowHidden(row, not visible)
+        self.proxy.set_pattern(text)
 
     def load_selected_project(self):
-        selected = self.table.currentRow()
-        if selected == -1:
+        selected = self.table.currentIndex()
+        if not selected.isValid():
             QMessageBox.warning(self, "No Selection", "Please select a project to open.")
             return
 
-        filename = self.table.item(selected, 0).text()
+        filename = self.proxy.entry_for(selected).name
         path = os.path.join(self.folder_path, filename)
         self.load_callback(path)
         self.accept()
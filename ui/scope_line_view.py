@@ -0,0 +1,184 @@
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex, QSize, pyqtSignal
+from PyQt6.QtGui import QFont, QFontMetrics, QPen, QColor
+from PyQt6.QtWidgets import QAbstractItemView, QListView, QStyle, QStyledItemDelegate
+
+KIND_ROLE = Qt.ItemDataRole.UserRole
+
+# Left margin of each line kind in indent steps, as in render_line
+INDENT_STEPS = {"item": 1, "subitem": 2, "bullet": 1, "ordered": 1, "letter": 1}
+BOLD_KINDS = {"section", "bold", "subsection", "roman"}
+RULE_COLOR = QColor("#333")
+
+# Document blocks searched for each line; a rendered line makes at most three
+BLOCK_LOOKAHEAD = 8
+
+
+def _normalized(text):
+    # Rich text collapses runs of whitespace
+    return " ".join(text.split())
+
+
+def block_for_line(document, lines, row):
+    """The QTextDocument block showing line row of (kind, text) lines.
+
+    Rich text adds blocks of its own (the header, a rule before every
+    section), so blocks are matched to lines by their text, in order.
+    Lines without text map to the block of the nearest line before them.
+    """
+    found = document.firstBlock()
+    block = found
+    for kind, text in lines[:row + 1]:
+        text = _normalized(text)
+        if not text:
+            continue
+        candidate = block
+        for _ in range(BLOCK_LOOKAHEAD):
+            if not candidate.isValid():
+                break
+            if _normalized(candidate.text()) == text:
+                found = candidate
+                block = candidate.next()
+                break
+            candidate = candidate.next()
+    return found
+
+
+class ScopeLineListModel(QAbstractListModel):
+    """Read-only list of classified scope lines, one (kind, text) per row."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._lines = []
+
+    def set_lines(self, lines):
+        self.beginResetModel()
+        self._lines = lines
+        self.endResetModel()
+
+    def lines(self):
+        return self._lines
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._lines)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        kind, text = self._lines[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return text
+        if role == Qt.ItemDataRole.ToolTipRole:
+            # Long lines are elided in the view
+            return text or None
+        if role == KIND_ROLE:
+            return kind
+        return None
+
+
+class ScopeLineDelegate(QStyledItemDelegate):
+    """Paints one scope line the way render_line lays it out, without a text document."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.font = QFont("Arial", 11)
+        self.indent_size = 20
+        self.line_height = 1.15
+
+    def set_style(self, style):
+        """Take font size, indent and line spacing from a PreviewStyle"""
+        self.font = QFont("Arial", style.font_size)
+        self.indent_size = style.indent_size
+        self.line_height = float(style.line_height)
+
+    def sizeHint(self, option, index):
+        # Every row has the same height (the view uses uniform item sizes);
+        # leave room for the slightly larger section headings
+        heading = QFont(self.font)
+        heading.setPointSize(self.font.pointSize() + 1)
+        return QSize(0, round(QFontMetrics(heading).height() * self.line_height) + 4)
+
+    def paint(self, painter, option, index):
+        kind = index.data(KIND_ROLE)
+        text = index.data()
+        rect = option.rect
+        painter.save()
+        # Selection and hover background, as the default delegate draws it
+        style = option.widget.style() if option.widget else None
+        if style is not None:
+            style.drawPrimitive(QStyle.PrimitiveElement.PE_PanelItemViewItem, option, painter, option.widget)
+
+        if kind in ("divider", "section"):
+            pen = QPen(RULE_COLOR, 2 if kind == "divider" else 1)
+            painter.setPen(pen)
+            y = rect.center().y() if kind == "divider" else rect.top() + 1
+            painter.drawLine(rect.left(), y, rect.right(), y)
+
+        if text:
+            font = QFont(self.font)
+            if kind in BOLD_KINDS:
+                font.setBold(True)
+            if kind == "section":
+                font.setPointSize(self.font.pointSize() + 1)
+            if kind == "bullet":
+                text = f"• {text}"
+            elif kind == "ordered":
+                # Each ordered line is its own <ol> in the HTML, which shows 1. too
+                text = f"1. {text}"
+
+            text_rect = rect.adjusted(4 + INDENT_STEPS.get(kind, 0) * self.indent_size, 0, -4, 0)
+            painter.setFont(font)
+            selected = option.state & QStyle.StateFlag.State_Selected
+            painter.setPen((option.palette.highlightedText() if selected else option.palette.text()).color())
+            elided = QFontMetrics(font).elidedText(text, Qt.TextElideMode.ElideRight, text_rect.width())
+            painter.drawText(text_rect, Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter, elided)
+
+        painter.restore()
+
+
+class ScopeLineView(QListView):
+    """Virtualized, read-only preview: only the rows on screen are painted.
+
+    Double-clicking or typing emits editRequested with the row, so the
+    owner can switch to an editable document. Long lines are elided, and
+    currentLineChanged carries the full text of the current row.
+    """
+    editRequested = pyqtSignal(int)
+    currentLineChanged = pyqtSignal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.line_model = ScopeLineListModel(self)
+        self.delegate = ScopeLineDelegate(self)
+        self.setModel(self.line_model)
+        self.setItemDelegate(self.delegate)
+        # Row heights never depend on the text, so layout is constant time
+        self.setUniformItemSizes(True)
+        self.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.doubleClicked.connect(lambda index: self.editRequested.emit(index.row()))
+
+    def set_lines(self, lines, style):
+        """Show (kind, text) lines with a PreviewStyle's font, indent and spacing"""
+        self.delegate.set_style(style)
+        self.line_model.set_lines(lines)
+
+    def lines(self):
+        return self.line_model.lines()
+
+    def currentChanged(self, current, previous):
+        super().currentChanged(current, previous)
+        self.currentLineChanged.emit((current.data() or "") if current.isValid() else "")
+
+    def keyPressEvent(self, event):
+        modifiers = event.modifiers() & ~Qt.KeyboardModifier.ShiftModifier
+        if event.text().strip() and modifiers == Qt.KeyboardModifier.NoModifier:
+            current = self.currentIndex()
+            if current.isValid():
+                row = current.row()
+            else:
+                row = self.indexAt(self.viewport().rect().topLeft()).row()
+            self.editRequested.emit(max(row, 0))
+            return
+        super().keyPressEvent(event)
@@ -1,12 +1,24 @@
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QLabel, QTextEdit, QPushButton, 
     QHBoxLayout, QMessageBox, QComboBox, QCheckBox, QSpinBox,
-    QFormLayout, QSlider, QFrame, QToolButton, QButtonGroup
+    QFormLayout, QSlider, QFrame, QToolButton, QButtonGroup, QStackedWidget
 )
 from PyQt6.QtGui import QGuiApplication, QTextCursor, QFont, QTextCharFormat, QTextBlockFormat, QKeyEvent, QTextListFormat
-from PyQt6.QtCore import Qt
-from logic.undo_redo import Command
+from PyQt6.QtCore import Qt, QThreadPool, QTimer, pyqtSignal
+from logic.atomic_write import atomic_write_text
+from logic.undo_redo import LineDelta, LineDeltaCommand
 from logic.undo_manager import undo_manager
+from logic import scope_renderer
+from ui.background_tasks import PreviewRenderTask
+from ui.scope_line_view import ScopeLineView, block_for_line
+from logic.scope_renderer import DEEP_NUMBERING, LINE_HEIGHTS, NUMBERING_SCHEMES, PreviewStyle
+
+# Scope changes arriving within this window are rendered once
+PREVIEW_DELAY_MS = 50
+
+# Scopes with at least this many lines are shown in the virtualized line
+# view, and only laid out as a full document once the user edits them
+LINE_VIEW_THRESHOLD = 2000
 
 
 class IndentableTextEdit(QTextEdit):
@@ -205,11 +217,36 @@ class IndentableTextEdit(QTextEdit):
 
 
 class ScopePreviewPanel(QWidget):
-    def __init__(self):
+    # Label scheme picked for items below level 2; the scope tree renders them
+    deepNumberingChanged = pyqtSignal(str)
+
+    def __init__(self, record_history=False, update_delay=PREVIEW_DELAY_MS):
         super().__init__()
 
+        # The preview is normally derived from the scope tree, which owns the
+        # undo history. record_history=True keeps a separate preview history
+        # for standalone use.
+        self.record_history = record_history
+
         # Initialize values first
         self._current_text_data = ""
+        # (text, ScopeLine records) when the text came from the scope tree
+        self._line_records = None
+
+        # Updates are coalesced: only the latest pending scope is rendered,
+        # once the timer fires or something needs the preview right away
+        self._pending_update = None
+        self.update_timer = QTimer(self)
+        self.update_timer.setSingleShot(True)
+        self.update_timer.setInterval(update_delay)
+        self.update_timer.timeout.connect(self.flush_preview)
+
+        # HTML is built on a worker thread; each render bumps the generation
+        # and results from older generations are dropped on arrival
+        self._render_generation = 0
+        self._render_pending = False
+        # The line view is showing a scope the text edit does not have yet
+        self._document_stale = False
         self._font_size_value = 11
         self._indent_size_value = 20
 
@@ -226,8 +263,28 @@ class ScopePreviewPanel(QWidget):
         
         # Set up rich text formatting
         self.setup_rich_text_formatting()
-        
-        layout.addWidget(self.text_edit)
+
+        # Read-only view of large scopes that only paints the visible lines
+        self.line_view = ScopeLineView()
+        self.line_view.editRequested.connect(self.start_editing)
+
+        # Full text of the selected line, which the line view may elide
+        self.line_detail = QLabel()
+        self.line_detail.setWordWrap(True)
+        self.line_detail.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
+        self.line_detail.hide()
+        self.line_view.currentLineChanged.connect(self.show_line_detail)
+
+        self.line_page = QWidget()
+        line_layout = QVBoxLayout(self.line_page)
+        line_layout.setContentsMargins(0, 0, 0, 0)
+        line_layout.addWidget(self.line_view)
+        line_layout.addWidget(self.line_detail)
+
+        self.preview_stack = QStackedWidget()
+        self.preview_stack.addWidget(self.text_edit)
+        self.preview_stack.addWidget(self.line_page)
+        layout.addWidget(self.preview_stack)
 
         # Buttons
         self.setup_action_buttons(layout)
@@ -503,6 +560,12 @@ class ScopePreviewPanel(QWidget):
         ])
         self.numbering_style.currentTextChanged.connect(self.refresh_preview)
         numbering_group.addWidget(self.numbering_style)
+        numbering_group.addWidget(QLabel("Sub-items:"))
+        self.deep_numbering = QComboBox()
+        self.deep_numbering.addItems(NUMBERING_SCHEMES)
+        self.deep_numbering.setCurrentText(DEEP_NUMBERING)
+        self.deep_numbering.currentTextChanged.connect(self.deepNumberingChanged)
+        numbering_group.addWidget(self.deep_numbering)
         bottom_row.addLayout(numbering_group)
         
         bottom_row.addStretch()
@@ -513,11 +576,13 @@ class ScopePreviewPanel(QWidget):
 
     def toggle_bullet_list(self):
         """Toggle bullet list formatting"""
+        self.start_editing()
         self.text_edit.toggle_bullet_list()
         self.update_list_button_states()
 
     def toggle_numbered_list(self):
         """Toggle numbered list formatting"""
+        self.start_editing()
         self.text_edit.toggle_numbered_list()
         self.update_list_button_states()
 
@@ -539,6 +604,7 @@ class ScopePreviewPanel(QWidget):
 
     def insert_horizontal_line(self):
         """Insert a horizontal line"""
+        self.start_editing()
         self.text_edit.insert_horizontal_line()
 
     def increase_font_size(self):
@@ -601,214 +667,158 @@ class ScopePreviewPanel(QWidget):
         # Connect cursor position changed to update button states
         self.text_edit.cursorPositionChanged.connect(self.update_list_button_states)
 
+    def set_update_delay(self, msec):
+        """Milliseconds to wait for further scope changes before rendering"""
+        self.update_timer.setInterval(msec)
+
     def update_preview(self, text_data):
-        """Update preview with rich text formatting"""
-        old_text = self.text_edit.toHtml()
+        """Schedule a preview update with rich text formatting"""
+        self._pending_update = (text_data, None)
+        self.update_timer.start()
+
+    def update_preview_lines(self, lines):
+        """Schedule a preview update from the scope tree's ScopeLine records.
+
+        Formatting reads the records' level and label directly instead of
+        re-parsing every line of the joined text.
+        """
+        self._pending_update = (None, lines)
+        self.update_timer.start()
+
+    def flush_preview(self):
+        """Render a pending scope update now, finishing any background render"""
+        self.update_timer.stop()
+        if self._pending_update is not None:
+            text_data, lines = self._pending_update
+            self._pending_update = None
+            if lines is not None:
+                text_data = scope_renderer.lines_to_text(lines)
+                self._line_records = (text_data, lines)
+            self._show_text(text_data)
+        if self._render_pending or self._document_stale:
+            # Callers about to read the document cannot wait for the worker
+            self._render_generation += 1
+            self._render_pending = False
+            self._document_stale = False
+            self._set_content(self.render_content(self._current_text_data))
+
+    def start_editing(self, row=0):
+        """Leave the line view for the editable document, near row"""
+        if self.preview_stack.currentWidget() is not self.line_page:
+            return
+        self.flush_preview()
+        self.preview_stack.setCurrentWidget(self.text_edit)
+        block = block_for_line(self.text_edit.document(), self.line_view.lines(), row)
+        if block.isValid():
+            self.text_edit.setTextCursor(QTextCursor(block))
+            self.text_edit.ensureCursorVisible()
+        self.text_edit.setFocus()
+
+    def show_line_detail(self, text):
+        self.line_detail.setText(text)
+        self.line_detail.setVisible(bool(text))
+
+    def _show_text(self, text_data):
+        if text_data == self._current_text_data:
+            return
+
+        if not self.record_history:
+            self._set_source_text(text_data)
+            return
+
+        undo_manager.push(LineDeltaCommand(
+            get_text=lambda: self._current_text_data,
+            set_text=self._set_source_text,
+            delta=LineDelta.between(self._current_text_data, text_data),
+            description="Update Preview",
+            merge_key="preview"
+        ))
+
+    def _records_for(self, text_data):
+        if self._line_records is not None and self._line_records[0] == text_data:
+            return self._line_records[1]
+        return None
+
+    def _set_source_text(self, text_data):
+        """Replace the scope text and re-render it in the current format"""
         self._current_text_data = text_data
-        
+        self._render_generation += 1
+        output_format = self.format_combo.currentText()
+        if text_data.count("\n") + 1 >= LINE_VIEW_THRESHOLD:
+            self._show_line_view(text_data, output_format)
+            return
+
+        self._document_stale = False
+        self.preview_stack.setCurrentWidget(self.text_edit)
+        if output_format not in ("Rich Text", "HTML"):
+            self._render_pending = False
+            self._set_content(text_data)
+            return
+
+        render = scope_renderer.format_as_rich_text if output_format == "Rich Text" else scope_renderer.format_as_html
+        task = PreviewRenderTask(
+            self._render_generation, render, text_data, self.preview_style(), self._records_for(text_data)
+        )
+        task.signals.finished.connect(self._on_render_finished)
+        task.signals.failed.connect(self._on_render_failed)
+        self._render_pending = True
+        QThreadPool.globalInstance().start(task)
+
+    def _show_line_view(self, text_data, output_format):
+        """Show a large scope in the line view; the document is built on demand"""
+        self._render_pending = False
+        self._document_stale = True
+        style = self.preview_style()
+        if output_format in ("Rich Text", "HTML"):
+            lines = scope_renderer.classify_lines(text_data, style.numbering_style, self._records_for(text_data))
+        else:
+            lines = [("plain", line) for line in text_data.split("\n")]
+        self.line_view.set_lines(lines, style)
+        self.show_line_detail("")
+        self.preview_stack.setCurrentWidget(self.line_page)
+
+    def _on_render_finished(self, generation, content):
+        if generation != self._render_generation:
+            return
+        self._render_pending = False
+        self._set_content(content)
+
+    def _on_render_failed(self, generation, message):
+        if generation != self._render_generation:
+            return
+        # Render on the GUI thread instead, where errors surface as usual
+        self._render_pending = False
+        self._set_content(self.render_content(self._current_text_data))
+
+    def render_content(self, text_data):
+        """Render scope text for the selected preview format"""
         if self.format_combo.currentText() == "Rich Text":
-            new_text = self.format_as_rich_text(text_data)
+            return self.format_as_rich_text(text_data)
         elif self.format_combo.currentText() == "HTML":
-            new_text = self.format_as_html(text_data)
-        else:
-            new_text = text_data  # Plain text
-            
-        undo_manager.push(Command(
-            do_func=lambda: self._set_content(new_text),
-            undo_func=lambda: self._set_content(old_text),
-            description="Update Preview"
-        ))
+            return self.format_as_html(text_data)
+        return text_data  # Plain text
+
+    def preview_style(self):
+        """Snapshot the current formatting controls as a PreviewStyle"""
+        return PreviewStyle(
+            font_size=self._font_size_value,
+            indent_size=self._indent_size_value,
+            line_height=self.get_line_height(),
+            numbering_style=self.numbering_style.currentText(),
+            professional=self.professional_style.isChecked()
+        )
 
     def format_as_rich_text(self, text_data):
         """Convert plain text to rich HTML formatting with enhanced styling"""
-        if not text_data.strip():
-            return ""
-            
-        lines = text_data.split('\n')
-        html_content = []
-        
-        # Get formatting settings
-        font_size = self._font_size_value
-        indent_size = self._indent_size_value
-        line_height = self.get_line_height()
-        style = self.numbering_style.currentText()
-        
-        # Professional document header
-        if self.professional_style.isChecked():
-            html_content.append(f'''
-            <div style="text-align: center; margin-bottom: 25px; page-break-inside: avoid;">
-                <h1 style="font-size: {font_size + 3}pt; font-weight: bold; margin: 0; letter-spacing: 1px;">
-                    03-0000 CONCRETE SCOPE OF WORK
-                </h1>
-            </div>
-            ''')
-        
-        section_counter = 0
-        subsection_counters = {}
-        
-        for line in lines:
-            line = line.strip()
-            if not line:
-                html_content.append('<br>')
-                continue
-                
-            # Handle section dividers
-            if line.startswith('----') or line.startswith('****'):
-                html_content.append('<hr style="border: none; border-bottom: 2px solid #333; margin: 20px 0 15px 0;">')
-                continue
-            
-            # Main section headers (all caps, **bold**)
-            if line.startswith('**') and line.endswith('**'):
-                section_title = line[2:-2].strip()
-                if section_title.isupper():
-                    section_counter += 1
-                    subsection_counters[section_counter] = 0
-                    
-                    html_content.append('<hr style="border: none; border-bottom: 1px solid #333; margin: 15px 0 5px 0;">')
-                    html_content.append(f'''
-                    <h2 style="font-size: {font_size + 1}pt; font-weight: bold; margin: 15px 0 12px 0; 
-                              text-align: left; letter-spacing: 0.5px; line-height: {line_height};">
-                        {section_title}
-                    </h2>
-                    ''')
-                else:
-                    html_content.append(f'<p style="font-weight: bold; margin: 10px 0; font-size: {font_size}pt;">{section_title}</p>')
-                continue
-            
-            # Process numbered/lettered items based on style
-            formatted_line = self.format_line_with_hierarchy(line, font_size, indent_size, line_height, style)
-            html_content.append(formatted_line)
-        
-        return ''.join(html_content)
-
-    def format_line_with_hierarchy(self, line, font_size, indent_size, line_height, style):
-        """Format a line based on its hierarchy level and selected style"""
-        import re
-        
-        if style == "Professional":
-            # Detect line type and format accordingly
-            if re.match(r'^\s*[A-Z]\.\s+', line):
-                # Subsection headers (A., B., C.)
-                return f'''
-                <p style="font-size: {font_size}pt; font-weight: bold; margin: 12px 0 8px 0; 
-                         line-height: {line_height}; color: #000;">
-                    {line.strip()}
-                </p>
-                '''
-            elif re.match(r'^\s+\d+\.\s+', line):
-                # Numbered items under subsections
-                return f'''
-                <p style="font-size: {font_size}pt; margin: 4px 0 4px {indent_size}px; 
-                         line-height: {line_height}; text-align: justify;">
-                    {line.strip()}
-                </p>
-                '''
-            elif re.match(r'^\s*\d+\.\d+\.\s+', line):
-                # Sub-numbered items (1.1., 1.2., etc.)
-                return f'''
-                <p style="font-size: {font_size}pt; margin: 3px 0 3px {indent_size * 2}px; 
-                         line-height: {line_height}; text-align: justify;">
-                    {line.strip()}
-                </p>
-                '''
-        
-        elif style == "Standard Lists":
-            # Use bullet points and simple numbering
-            if re.match(r'^\s*•\s+', line) or re.match(r'^\s*\*\s+', line):
-                stripped_line = line.strip()[1:].strip()
-                return f'''
-                <ul style="margin: 4px 0; padding-left: {indent_size}px;">
-                    <li style="font-size: {font_size}pt; line-height: {line_height};">
-                        {stripped_line}
-                    </li>
-                </ul>
-                '''
-            elif re.match(r'^\s*\d+\.\s+', line):
-                stripped_line = re.sub(r'^\s*\d+\.\s*', '', line.strip())
-                return f'''
-                <ol style="margin: 4px 0; padding-left: {indent_size}px;">
-                    <li style="font-size: {font_size}pt; line-height: {line_height};">
-                        {stripped_line}
-                    </li>
-                </ol>
-                '''
-        
-        elif style == "Academic":
-            # Roman numerals, letters, numbers
-            if re.match(r'^\s*[IVX]+\.\s+', line):
-                return f'''
-                <p style="font-size: {font_size}pt; font-weight: bold; margin: 10px 0 6px 0; 
-                         line-height: {line_height};">
-                    {line.strip()}
-                </p>
-                '''
-            elif re.match(r'^\s*[A-Z]\.\s+', line):
-                return f'''
-                <p style="font-size: {font_size}pt; margin: 6px 0 4px {indent_size}px; 
-                         line-height: {line_height}; font-weight: 500;">
-                    {line.strip()}
-                </p>
-                '''
-        
-        # Default formatting for regular text
-        return f'''
-        <p style="font-size: {font_size}pt; margin: 5px 0; line-height: {line_height};">
-            {line.strip()}
-        </p>
-        '''
+        return scope_renderer.format_as_rich_text(text_data, self.preview_style(), self._records_for(text_data))
 
     def get_line_height(self):
         """Get line height based on spacing setting"""
-        spacing_map = {
-            "Single": "1.0",
-            "1.15": "1.15", 
-            "1.5": "1.5",
-            "Double": "2.0"
-        }
-        return spacing_map.get(self.line_spacing.currentText(), "1.15")
+        return LINE_HEIGHTS.get(self.line_spacing.currentText(), "1.15")
 
     def format_as_html(self, text_data):
         """Format as clean HTML for export with enhanced styling"""
-        font_size = self._font_size_value
-        indent_size = self._indent_size_value
-        line_height = self.get_line_height()
-        
-        # Build CSS styles separately to avoid f-string backslash issues
-        body_style = f'body {{ font-family: Arial, sans-serif; font-size: {font_size}pt; line-height: {line_height}; margin: 1in; color: #000; }}'
-        h1_style = f'h1 {{ font-size: {font_size + 3}pt; text-align: center; margin-bottom: 25px; letter-spacing: 1px; }}'
-        h2_style = f'h2 {{ font-size: {font_size + 1}pt; margin: 15px 0 12px 0; letter-spacing: 0.5px; }}'
-        indent1_style = f'.indent-1 {{ margin-left: {indent_size}px; }}'
-        indent2_style = f'.indent-2 {{ margin-left: {indent_size * 2}px; }}'
-        indent3_style = f'.indent-3 {{ margin-left: {indent_size * 3}px; }}'
-        
-        html = [
-            '<!DOCTYPE html>',
-            '<html>',
-            '<head>',
-            '<meta charset="UTF-8">',
-            '<title>Concrete Scope of Work</title>',
-            '<style>',
-            body_style,
-            h1_style,
-            h2_style,
-            'hr { border: none; border-bottom: 1px solid #333; margin: 15px 0 5px 0; }',
-            indent1_style,
-            indent2_style,
-            indent3_style,
-            '.subsection { font-weight: bold; margin: 12px 0 8px 0; }',
-            '.item { margin: 4px 0; text-align: justify; }',
-            'ul, ol { margin: 4px 0; padding-left: 20px; }',
-            'li { margin: 2px 0; }',
-            '@page { margin: 1in; }',
-            '@media print { body { margin: 0; } }',
-            '</style>',
-            '</head>',
-            '<body>'
-        ]
-        
-        html.append(self.format_as_rich_text(text_data))
-        html.extend(['</body>', '</html>'])
-        return ''.join(html)
+        return scope_renderer.format_as_html(text_data, self.preview_style(), self._records_for(text_data))
 
     def toggle_formatting_controls(self, checked):
         """Toggle visibility of formatting controls"""
@@ -825,8 +835,10 @@ class ScopePreviewPanel(QWidget):
 
     def refresh_preview(self):
         """Refresh the preview with current formatting"""
-        if hasattr(self, '_current_text_data'):
-            self.update_preview(self._current_text_data)
+        # Formatting is derived from the scope text, so no undo entry is needed
+        if hasattr(self, 'text_edit'):
+            self.flush_preview()
+            self._set_source_text(self._current_text_data)
 
     def _set_content(self, content):
         """Set content based on format type"""
@@ -837,26 +849,31 @@ class ScopePreviewPanel(QWidget):
         self.text_edit.moveCursor(QTextCursor.MoveOperation.Start)
 
     def append_line(self, line):
-        old_content = self.get_preview_content()
-        new_content = old_content + "\n" + line
-
-        undo_manager.push(Command(
-            do_func=lambda: self._set_content(new_content),
-            undo_func=lambda: self._set_content(old_content),
-            description="Append Line"
-        ))
+        self.flush_preview()
+        self.update_preview(self._current_text_data + "\n" + line)
 
     def clear(self):
-        old_content = self.get_preview_content()
+        # A scope update still waiting would otherwise overwrite the clear
+        self.update_timer.stop()
+        self._pending_update = None
+        delta = LineDelta.between(self._current_text_data, "")
+        if delta.is_empty():
+            return
+
+        if not self.record_history:
+            self._set_source_text("")
+            return
 
-        undo_manager.push(Command(
-            do_func=lambda: self._set_content(""),
-            undo_func=lambda: self._set_content(old_content),
+        undo_manager.push(LineDeltaCommand(
+            get_text=lambda: self._current_text_data,
+            set_text=self._set_source_text,
+            delta=delta,
             description="Clear Preview"
         ))
 
     def get_preview_content(self):
         """Get content based on current format"""
+        self.flush_preview()
         if self.format_combo.currentText() in ["Rich Text", "HTML"]:
             return self.text_edit.toHtml()
         else:
@@ -864,9 +881,11 @@ class ScopePreviewPanel(QWidget):
 
     def get_preview_text(self):
         """Get plain text version"""
+        self.flush_preview()
         return self.text_edit.toPlainText()
 
     def copy_to_clipboard(self):
+        self.flush_preview()
         if self.format_combo.currentText() == "Rich Text":
             # Copy as rich text to clipboard
             self.text_edit.selectAll()
@@ -892,10 +911,10 @@ class ScopePreviewPanel(QWidget):
             )
             
             if file_path:
+                self.flush_preview()
                 content = self.format_as_html(self._current_text_data)
                 
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(content)
+                atomic_write_text(file_path, content)
                 
                 QMessageBox.information(self, "Export", 
                     f"Document exported successfully.\nFile can be opened in Microsoft Word.")
@@ -905,6 +924,7 @@ class ScopePreviewPanel(QWidget):
 
     def print_preview(self):
         """Show print preview"""
+        self.flush_preview()
         try:
             from PyQt6.QtPrintSupport import QPrintPreviewDialog, QPrinter
             
@@ -0,0 +1,316 @@
+from PyQt6.QtCore import Qt, QAbstractItemModel, QModelIndex, QMimeData, pyqtSignal
+from PyQt6.QtGui import QBrush, QColor
+
+from logic.scope_model import ScopeNode
+
+SCOPE_NODES_MIME = "application/x-scopebuilder-nodes"
+
+# Children are exposed to the view in batches as branches are expanded/scrolled
+FETCH_BATCH = 200
+
+SEARCH_MATCH_COLOR = QColor(255, 236, 150)
+
+
+class ScopeTreeModel(QAbstractItemModel):
+    """Tree model over ScopeNodes with lazy, batched child population.
+
+    Only the first fetched(node) children of a node are visible to views;
+    canFetchMore/fetchMore expose the rest on demand, so opening a large
+    template only creates view state for the rows actually shown.
+    """
+    # (node, attribute, old value, new value) for edits made through the model
+    nodeChanged = pyqtSignal(object, str, object, object)
+    # (parent node, row, nodes) and (parent node, row, count) for edits made through the model
+    nodesInserted = pyqtSignal(object, int, list)
+    nodesRemoved = pyqtSignal(object, int, int)
+    # Nodes were added, removed or replaced (not emitted for lazy fetching)
+    structureChanged = pyqtSignal()
+
+    def __init__(self, checkable=False, parent=None):
+        super().__init__(parent)
+        self.checkable = checkable
+        self.root = ScopeNode("")
+        self._fetched = {}
+        self._drag_nodes = []
+        self._search_matches = {}
+
+    def set_nodes(self, nodes):
+        self.beginResetModel()
+        self.root = ScopeNode("", children=nodes)
+        self._fetched = {}
+        self._drag_nodes = []
+        self._search_matches = {}
+        self.endResetModel()
+        self.structureChanged.emit()
+
+    def node_from_index(self, index):
+        return index.internalPointer() if index.isValid() else self.root
+
+    def index_for(self, node):
+        if node is self.root or node is None:
+            return QModelIndex()
+        return self.createIndex(node.row, 0, node)
+
+    def fetched(self, node):
+        return self._fetched.get(id(node), 0)
+
+    def is_exposed(self, node):
+        """True if the node and all its ancestors have been fetched into the view"""
+        while node.parent is not None:
+            if node.row >= self.fetched(node.parent):
+                return False
+            node = node.parent
+        return node is self.root
+
+    def reveal(self, node):
+        """Fetch the node and its ancestors into the view and return its index"""
+        chain = []
+        while node.parent is not None:
+            chain.append(node)
+            node = node.parent
+        for child in reversed(chain):
+            parent = child.parent
+            if child.row >= self.fetched(parent):
+                # Round up to a whole batch so nearby rows come along
+                end = min(len(parent.children), (child.row // FETCH_BATCH + 1) * FETCH_BATCH)
+                self._expose(self.index_for(parent), parent, self.fetched(parent), end)
+        return self.index_for(chain[0]) if chain else QModelIndex()
+
+    def set_search_matches(self, nodes):
+        """Highlight the given nodes, repainting only rows whose state changed"""
+        old = self._search_matches
+        self._search_matches = {id(node): node for node in nodes}
+        changed = [node for key, node in self._search_matches.items() if key not in old]
+        changed += [node for key, node in old.items() if key not in self._search_matches]
+        for node in changed:
+            if self.is_exposed(node):
+                index = self.index_for(node)
+                self.dataChanged.emit(index, index, [Qt.ItemDataRole.BackgroundRole])
+
+    # --- QAbstractItemModel interface ---
+
+    def index(self, row, column, parent=QModelIndex()):
+        node = self.node_from_index(parent)
+        if column != 0 or row < 0 or row >= self.fetched(node):
+            return QModelIndex()
+        return self.createIndex(row, column, node.children[row])
+
+    def parent(self, index):
+        if not index.isValid():
+            return QModelIndex()
+        return self.index_for(index.internalPointer().parent)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.column() > 0:
+            return 0
+        return self.fetched(self.node_from_index(parent))
+
+    def columnCount(self, parent=QModelIndex()):
+        return 1
+
+    def hasChildren(self, parent=QModelIndex()):
+        return bool(self.node_from_index(parent).children)
+
+    def canFetchMore(self, parent):
+        node = self.node_from_index(parent)
+        return self.fetched(node) < len(node.children)
+
+    def fetchMore(self, parent):
+        node = self.node_from_index(parent)
+        start = self.fetched(node)
+        end = min(start + FETCH_BATCH, len(node.children))
+        self._expose(parent, node, start, end)
+
+    def fetch_all(self, node):
+        self._expose(self.index_for(node), node, self.fetched(node), len(node.children))
+
+    def _expose(self, parent, node, start, end):
+        if end <= start:
+            return
+        self.beginInsertRows(parent, start, end - 1)
+        self._fetched[id(node)] = end
+        self.endInsertRows()
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return "Scope Item"
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        node = index.internalPointer()
+
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            return node.title
+        if role == Qt.ItemDataRole.CheckStateRole and self.checkable:
+            return Qt.CheckState.Checked if node.checked else Qt.CheckState.Unchecked
+        if role == Qt.ItemDataRole.ToolTipRole and node.locked:
+            return "🔒 Locked"
+        if role == Qt.ItemDataRole.ForegroundRole and node.highlight:
+            return QBrush(Qt.GlobalColor.darkYellow)
+        if role == Qt.ItemDataRole.BackgroundRole and id(node) in self._search_matches:
+            return QBrush(SEARCH_MATCH_COLOR)
+        if role == Qt.ItemDataRole.UserRole:
+            return "locked" if node.locked else ""
+        if role == Qt.ItemDataRole.UserRole + 1:
+            return "highlight" if node.highlight else ""
+        return None
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if not index.isValid():
+            return False
+        node = index.internalPointer()
+
+        if role == Qt.ItemDataRole.EditRole:
+            self.set_node_value(node, "title", value)
+            return True
+        if role == Qt.ItemDataRole.CheckStateRole and self.checkable:
+            self.set_node_value(node, "checked", Qt.CheckState(value) == Qt.CheckState.Checked)
+            return True
+        return False
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.ItemIsDropEnabled
+
+        flags = (
+            Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+            | Qt.ItemFlag.ItemIsDragEnabled | Qt.ItemFlag.ItemIsDropEnabled
+        )
+        if self.checkable:
+            flags |= Qt.ItemFlag.ItemIsUserCheckable
+        if not index.internalPointer().locked:
+            flags |= Qt.ItemFlag.ItemIsEditable
+        return flags
+
+    # --- Edits ---
+
+    def set_node_value(self, node, attribute, value):
+        """Change one attribute of a node, notifying views and listeners"""
+        old = getattr(node, attribute)
+        if old == value:
+            return
+        setattr(node, attribute, value)
+        if self.is_exposed(node):
+            index = self.index_for(node)
+            self.dataChanged.emit(index, index)
+        self.nodeChanged.emit(node, attribute, old, value)
+
+    def apply_values(self, changes):
+        """Apply many (node, attribute, value) changes with a single view refresh"""
+        self.layoutAboutToBeChanged.emit()
+        for node, attribute, value in changes:
+            setattr(node, attribute, value)
+        self.layoutChanged.emit()
+
+    def insert_nodes(self, parent_node, row, nodes):
+        """Insert nodes under parent_node at a row within its fetched children"""
+        row = min(row, self.fetched(parent_node))
+        self.beginInsertRows(self.index_for(parent_node), row, row + len(nodes) - 1)
+        parent_node.insert_children(row, nodes)
+        self._fetched[id(parent_node)] = self.fetched(parent_node) + len(nodes)
+        self.endInsertRows()
+        self.nodesInserted.emit(parent_node, row, nodes)
+        self.structureChanged.emit()
+
+    def append_nodes(self, parent_node, nodes):
+        self.fetch_all(parent_node)
+        self.insert_nodes(parent_node, len(parent_node.children), nodes)
+
+    def move_nodes(self, nodes, target, row):
+        """Move nodes under target starting at row, keeping the node objects.
+
+        Undo commands and other references keep pointing at the moved nodes.
+        Each move is reported as nodesRemoved followed by nodesInserted.
+        """
+        for node in nodes:
+            source = node.parent
+            source_row = node.row
+            if source is target and source_row in (row - 1, row):
+                # Already in place
+                row = source_row + 1
+                continue
+
+            self.beginMoveRows(self.index_for(source), source_row, source_row, self.index_for(target), row)
+            source.remove_children(source_row, 1)
+            self._fetched[id(source)] = self.fetched(source) - 1
+            self.nodesRemoved.emit(source, source_row, 1)
+            if source is target and source_row < row:
+                row -= 1
+            target.insert_children(row, [node])
+            self._fetched[id(target)] = self.fetched(target) + 1
+            self.endMoveRows()
+            self.nodesInserted.emit(target, row, [node])
+            row += 1
+        self.structureChanged.emit()
+
+    def removeRows(self, row, count, parent=QModelIndex()):
+        node = self.node_from_index(parent)
+        if count <= 0 or row < 0 or row + count > self.fetched(node):
+            return False
+
+        self.beginRemoveRows(parent, row, row + count - 1)
+        removed = node.remove_children(row, count)
+        self._fetched[id(node)] = self.fetched(node) - count
+        self._forget(removed)
+        self.endRemoveRows()
+        self.nodesRemoved.emit(node, row, count)
+        self.structureChanged.emit()
+        return True
+
+    def _forget(self, nodes):
+        # Drop fetch bookkeeping so a new node reusing an id starts unfetched
+        for node in nodes:
+            if self._fetched.pop(id(node), None) is not None:
+                self._forget(node.children)
+
+    # --- Drag and drop (internal moves) ---
+
+    def supportedDropActions(self):
+        return Qt.DropAction.MoveAction
+
+    def mimeTypes(self):
+        return [SCOPE_NODES_MIME]
+
+    def mimeData(self, indexes):
+        nodes = []
+        for index in indexes:
+            node = index.internalPointer()
+            if index.column() == 0 and node not in nodes:
+                nodes.append(node)
+        # A selected ancestor already carries its descendants along
+        self._drag_nodes = [
+            node for node in nodes
+            if not any(self._is_ancestor(other, node) for other in nodes)
+        ]
+
+        mime = QMimeData()
+        mime.setData(SCOPE_NODES_MIME, b"")
+        return mime
+
+    def dropMimeData(self, data, action, row, column, parent):
+        if action != Qt.DropAction.MoveAction or not data.hasFormat(SCOPE_NODES_MIME):
+            return False
+
+        target = self.node_from_index(parent)
+        if not self._drag_nodes or any(
+            node is target or self._is_ancestor(node, target) for node in self._drag_nodes
+        ):
+            return False
+
+        if row < 0:
+            row = self.fetched(target)
+        self.move_nodes(self._drag_nodes, target, row)
+        self._drag_nodes = []
+        # The nodes have been moved already; returning False stops the view
+        # from removing the dragged rows as it does after a MoveAction drop
+        return False
+
+    def _is_ancestor(self, node, other):
+        parent = other.parent
+        while parent is not None:
+            if parent is node:
+                return True
+            parent = parent.parent
+        return False
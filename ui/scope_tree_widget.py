@@ -1,15 +1,28 @@
 from PyQt6.QtWidgets import (
-    QWidget, QVBoxLayout, QTreeWidget, QTreeWidgetItem, QLabel
+    QWidget, QVBoxLayout, QHBoxLayout, QTreeView, QLabel, QProgressBar, QPushButton, QLineEdit
 )
-from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtCore import Qt, QThreadPool, pyqtSignal
+from logic.autosave import apply_records
 from logic.undo_redo import Command
 from logic.undo_manager import undo_manager
-import json
+from logic.save_manager import checked_nodes
+from logic.scope_model import get_checked_ids, get_checked_paths, has_node_ids, section_of
+from logic.scope_renderer import DEEP_NUMBERING, lines_to_text, render_section
+from logic.search_index import NodeTitleIndex
+from ui.background_tasks import TemplateLoadTask
+from ui.scope_tree_model import ScopeTreeModel
+from contextlib import contextmanager
 import os
 
 
 class ScopeTreeWidget(QWidget):
     scopeChanged = pyqtSignal(str)
+    # The same scope as ScopeLine records, for consumers that format it
+    scopeLinesChanged = pyqtSignal(list)
+    # Path of a template that has just replaced the tree
+    templateLoaded = pyqtSignal(str)
+    # [(node, attribute, new value)] for every node edit, including undo/redo
+    nodesEdited = pyqtSignal(list)
 
     def __init__(self):
         super().__init__()
@@ -20,179 +33,328 @@ class ScopeTreeWidget(QWidget):
         self.label = QLabel("Scope Tree")
         layout.addWidget(self.label)
 
-        self.tree = QTreeWidget()
-        self.tree.setHeaderLabels(["Scope Item"])
-        self.tree.setDragDropMode(QTreeWidget.DragDropMode.InternalMove)
+        # Progress row shown while a template loads in the background
+        self.load_progress = QWidget()
+        progress_layout = QHBoxLayout(self.load_progress)
+        progress_layout.setContentsMargins(0, 0, 0, 0)
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 100)
+        self.btn_cancel_load = QPushButton("Cancel")
+        self.btn_cancel_load.clicked.connect(self.cancel_load)
+        progress_layout.addWidget(self.progress_bar)
+        progress_layout.addWidget(self.btn_cancel_load)
+        layout.addWidget(self.load_progress)
+        self.load_progress.hide()
+
+        # Find bar; matches are highlighted and stepped through with Next/Previous
+        find_layout = QHBoxLayout()
+        self.find_input = QLineEdit()
+        self.find_input.setPlaceholderText("Find in scope...")
+        self.find_input.textChanged.connect(self.find_in_tree)
+        self.find_input.returnPressed.connect(self.find_next)
+        self.btn_find_prev = QPushButton("Previous")
+        self.btn_find_prev.clicked.connect(self.find_previous)
+        self.btn_find_next = QPushButton("Next")
+        self.btn_find_next.clicked.connect(self.find_next)
+        self.find_status = QLabel("")
+        find_layout.addWidget(self.find_input)
+        find_layout.addWidget(self.btn_find_prev)
+        find_layout.addWidget(self.btn_find_next)
+        find_layout.addWidget(self.find_status)
+        layout.addLayout(find_layout)
+
+        self.model = ScopeTreeModel(checkable=True, parent=self)
+
+        self.tree = QTreeView()
+        self.tree.setModel(self.model)
+        self.tree.setUniformRowHeights(True)
+        self.tree.setDragDropMode(QTreeView.DragDropMode.InternalMove)
         self.tree.setDefaultDropAction(Qt.DropAction.MoveAction)
-        self.tree.setEditTriggers(QTreeWidget.EditTrigger.DoubleClicked)
-        self.tree.setColumnCount(1)
+        self.tree.setEditTriggers(QTreeView.EditTrigger.DoubleClicked)
         layout.addWidget(self.tree)
 
-        self.tree.itemChanged.connect(self.on_item_changed)
-        self.tree.itemChanged.connect(self.track_item_changes)
+        self.model.nodeChanged.connect(self.on_node_changed)
+        # Only edits renumber a section; rows exposed by lazy fetching do not
+        self.model.nodesInserted.connect(lambda parent, row, nodes: self._on_nodes_changed(parent))
+        self.model.nodesRemoved.connect(lambda parent, row, count: self._on_nodes_changed(parent))
+        self.model.modelReset.connect(self.invalidate_section)
+        self.model.structureChanged.connect(self._invalidate_search)
+        # Inserts, removals, moves and new templates renumber the scope; the
+        # preview panel coalesces the resulting updates
+        self.model.structureChanged.connect(self._emit_scope)
 
         self.root_data = []
-        self._last_item_state = {}
+        self.template_path = None
+        self.deep_numbering = DEEP_NUMBERING
+        self._section_lines = {}
+        self._bulk_changes = None
+        self._replaying = False
+        self._load_task = None
+        self._title_index = None
+        self._find_matches = []
+        self._find_position = -1
 
-    def load_template(self, file_path):
+    def load_template(self, file_path, on_loaded=None):
+        """Load a template on a worker thread; on_loaded runs once the tree is populated"""
         if not os.path.exists(file_path):
             self.label.setText("File not found.")
             return
 
+        self.cancel_load()
+        task = TemplateLoadTask(file_path)
+        task.signals.progress.connect(self.progress_bar.setValue)
+        task.signals.finished.connect(
+            lambda data, nodes: self._on_template_loaded(task, file_path, data, nodes, on_loaded)
+        )
+        task.signals.failed.connect(lambda message: self._on_template_failed(task, message))
+        task.signals.cancelled.connect(lambda: self._finish_load(task, "Template load cancelled."))
+        self._load_task = task
+
+        self.label.setText(f"Loading: {os.path.basename(file_path)}...")
+        self.progress_bar.setValue(0)
+        self.load_progress.show()
+        QThreadPool.globalInstance().start(task)
+
+    def cancel_load(self):
+        if self._load_task is not None:
+            self._load_task.cancel()
+
+    def _finish_load(self, task, label_text):
+        # Results of a load superseded by a newer one are ignored
+        if task is not self._load_task:
+            return False
+        self._load_task = None
+        self.load_progress.hide()
+        self.label.setText(label_text)
+        return True
+
+    def _on_template_loaded(self, task, file_path, data, nodes, on_loaded):
+        if not self._finish_load(task, f"Loaded: {os.path.basename(file_path)}"):
+            return
+        self.root_data = data.get("sections", [])
+        self.template_path = file_path
+        # History entries refer to the nodes that are about to be replaced
+        undo_manager.clear()
+        self.model.set_nodes(nodes)
+        self.templateLoaded.emit(file_path)
+        if on_loaded:
+            on_loaded()
+
+    def _on_template_failed(self, task, message):
+        self._finish_load(task, f"Error loading template: {message}")
+
+    def clear(self):
+        self.cancel_load()
+        self.root_data = []
+        self.template_path = None
+        self.model.set_nodes([])
+
+    def on_node_changed(self, node, attribute, old, new):
+        self.invalidate_section(node)
+        self.nodesEdited.emit([(node, attribute, new)])
+        if attribute == "title":
+            self._invalidate_search()
+
+        # Changes replayed by undo/redo are already in the history
+        if not self._replaying:
+            undo_manager.push(self._history_command(
+                do_func=lambda: self.model.set_node_value(node, attribute, new),
+                undo_func=lambda: self.model.set_node_value(node, attribute, old),
+                description="Edit Text" if attribute == "title" else "Toggle Check"
+            ))
+
+        self._emit_scope()
+
+    def _history_command(self, do_func, undo_func, description):
+        """Wrap a tree mutation so replaying it is not recorded again"""
+        return Command(
+            do_func=lambda: self._replay(do_func),
+            undo_func=lambda: self._replay(undo_func),
+            description=description
+        )
+
+    def _replay(self, func):
+        self._replaying = True
         try:
-            with open(file_path, "r") as f:
-                data = json.load(f)
-                self.root_data = data.get("sections", [])
-                self.tree.clear()
-                self.build_tree(self.root_data, self.tree.invisibleRootItem())
-                self.label.setText(f"Loaded: {os.path.basename(file_path)}")
-        except Exception as e:
-            self.label.setText(f"Error loading template: {str(e)}")
-
-    def build_tree(self, items, parent):
-        for item in items:
-            title = item.get("title", item.get("text", "Untitled"))
-            tree_item = QTreeWidgetItem([title])
-            tree_item.setFlags(tree_item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
-            tree_item.setCheckState(0, Qt.CheckState.Unchecked)
-            tree_item.setFlags(tree_item.flags() | Qt.ItemFlag.ItemIsEditable)
-
-            if item.get("locked", False):
-                tree_item.setFlags(tree_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                tree_item.setToolTip(0, "🔒 Locked")
-                tree_item.setData(0, Qt.ItemDataRole.UserRole, "locked")
-
-            if item.get("highlight", False):
-                tree_item.setForeground(0, Qt.GlobalColor.darkYellow)
-                tree_item.setData(0, Qt.ItemDataRole.UserRole + 1, "highlight")
-
-            parent.addChild(tree_item)
-
-            if "children" in item:
-                self.build_tree(item["children"], tree_item)
-
-    def on_item_changed(self, item, column):
-        if column == 0:
-            scope_text = self.generate_scope_text()
-            self.scopeChanged.emit(scope_text)
-
-    def track_item_changes(self, item, column):
-        if column != 0:
+            func()
+        finally:
+            self._replaying = False
+
+    @contextmanager
+    def bulk_update(self, description="Bulk Update"):
+        """Apply many check-state changes as a single undoable step.
+
+        Changes made with set_check_state inside the block skip per-node
+        scope regeneration and undo recording; on exit one compound Command
+        is pushed, which refreshes the view and emits scopeChanged once. If
+        the block raises, the changes are reverted and nothing is pushed.
+        """
+        if self._bulk_changes is not None:
+            # Nested blocks fold into the outermost one
+            yield
             return
 
-        current_text = item.text(0)
-        current_check = item.checkState(0)
+        self._bulk_changes = {}
+        try:
+            yield
+        except BaseException:
+            # Nothing has been shown or recorded yet, so put the flags back
+            for node, old, new in self._bulk_changes.values():
+                node.checked = old
+            raise
+        finally:
+            # Nodes set back to their starting state need no history entry
+            changes = [(node, old, new) for node, old, new in self._bulk_changes.values() if old != new]
+            self._bulk_changes = None
 
-        prev = self._last_item_state.get(id(item))
-        self._last_item_state[id(item)] = (current_text, current_check)
+        if not changes:
+            return
 
-        if prev is None:
+        new_states = [(node, new) for node, old, new in changes]
+        old_states = [(node, old) for node, old, new in changes]
+        undo_manager.push(Command(
+            do_func=lambda: self._apply_check_states(new_states),
+            undo_func=lambda: self._apply_check_states(old_states),
+            description=description
+        ))
+
+    def set_check_state(self, node, checked):
+        """Check or uncheck a node, deferring notification if a bulk update is active"""
+        if self._bulk_changes is None:
+            self.model.set_node_value(node, "checked", checked)
             return
 
-        prev_text, prev_check = prev
+        key = id(node)
+        old = self._bulk_changes[key][1] if key in self._bulk_changes else node.checked
+        self._bulk_changes[key] = (node, old, checked)
+        node.checked = checked
 
-        if current_text != prev_text:
-            undo_manager.push(Command(
-                do_func=lambda: item.setText(0, current_text),
-                undo_func=lambda: item.setText(0, prev_text),
-                description="Edit Text"
-            ))
+    def _apply_check_states(self, states):
+        changes = [(node, "checked", checked) for node, checked in states]
+        self.model.apply_values(changes)
+        for node, _ in states:
+            self.invalidate_section(node)
+        self.nodesEdited.emit(changes)
 
-        if current_check != prev_check:
-            undo_manager.push(Command(
-                do_func=lambda: item.setCheckState(0, current_check),
-                undo_func=lambda: item.setCheckState(0, prev_check),
-                description="Toggle Check"
-            ))
+        self._emit_scope()
+
+    def apply_journal(self, records):
+        """Replay autosave journal records onto the loaded template"""
+        try:
+            apply_records(self.model.root, records)
+        finally:
+            # The nodes were changed behind the model's back; reset the views
+            undo_manager.clear()
+            self.model.set_nodes(self.model.root.children)
+
+    def invalidate_section(self, node=None):
+        """Drop cached scope lines for the section containing node (all if None)"""
+        if node is None:
+            self._section_lines.clear()
+            return
+        self._section_lines.pop(id(section_of(node)), None)
+
+    def _on_nodes_changed(self, parent):
+        # Structural edits (drag/drop, insert, remove) only affect the section
+        # they happen in; changes at the top level reset the whole cache.
+        if parent is self.model.root:
+            self.invalidate_section()
+        else:
+            self.invalidate_section(parent)
+
+    def _invalidate_search(self):
+        # The title index is rebuilt lazily; live matches are refreshed now
+        self._title_index = None
+        if self.find_input.text():
+            self.find_in_tree(self.find_input.text(), jump=False)
+
+    def find_in_tree(self, text, jump=True):
+        """Highlight every node matching text and jump to the first one"""
+        if self._title_index is None:
+            self._title_index = NodeTitleIndex(self.model.root.children)
+        self._find_matches = self._title_index.find(text)
+        self.model.set_search_matches(self._find_matches)
+
+        if not self._find_matches:
+            self._find_position = -1
+        elif jump or self._find_position < 0:
+            self._find_position = 0
+        else:
+            self._find_position = min(self._find_position, len(self._find_matches) - 1)
+
+        if jump and self._find_matches:
+            self._show_match()
+        else:
+            self._update_find_status()
+
+    def find_next(self):
+        self._step_match(1)
+
+    def find_previous(self):
+        self._step_match(-1)
+
+    def _step_match(self, step):
+        if not self._find_matches:
+            return
+        self._find_position = (self._find_position + step) % len(self._find_matches)
+        self._show_match()
+
+    def _show_match(self):
+        index = self.model.reveal(self._find_matches[self._find_position])
+        self.tree.setCurrentIndex(index)
+        self.tree.scrollTo(index)
+        self._update_find_status()
+
+    def _update_find_status(self):
+        if not self.find_input.text():
+            self.find_status.setText("")
+        elif not self._find_matches:
+            self.find_status.setText("No matches")
+        else:
+            self.find_status.setText(f"{self._find_position + 1} of {len(self._find_matches)}")
+
+    def generate_scope_lines(self):
+        """Scope as ScopeLine records (level, label, text), in display order"""
+        # Numbering (A., 1.) restarts in every top-level section, so each
+        # section's lines are cached and only the changed one is rebuilt.
+        result_lines = []
+        for section in self.model.root.children:
+            lines = self._section_lines.get(id(section))
+            if lines is None:
+                lines = render_section(section, self.deep_numbering)
+                self._section_lines[id(section)] = lines
+            result_lines.extend(lines)
+        return result_lines
+
+    def set_deep_numbering(self, scheme):
+        """Relabel items below level 2 with one of NUMBERING_SCHEMES"""
+        if scheme == self.deep_numbering:
+            return
+        self.deep_numbering = scheme
+        self.invalidate_section()
+        self._emit_scope()
 
     def generate_scope_text(self):
         """Generate formatted scope text that matches PDF structure exactly"""
-        divider_sections = {"MILESTONES", "ESTIMATED WORKFORCE", "CLARIFICATIONS", "SCOPE CLARIFICATIONS"}
-
-        def recurse(node, prefix_stack, parent_is_root=False):
-            lines = []
-            letter_counter = 0  # For A., B., C. subsections
-            number_counter = 0  # For 1., 2., 3. items under subsections
-            
-            for i in range(node.childCount()):
-                child = node.child(i)
-                if child.checkState(0) == Qt.CheckState.Checked:
-                    text = child.text(0).strip()
-                    
-                    # Determine hierarchy level
-                    level = len(prefix_stack)
-                    
-                    if level == 0:
-                        # Top-level sections (SCOPE CLARIFICATIONS, ESTIMATED WORKFORCE, etc.)
-                        text_upper = text.upper()
-                        if any(section in text_upper for section in divider_sections):
-                            lines.append("----------------------------------------")
-                        lines.append(f"**{text_upper}**")
-                        lines.append("")
-                        
-                    elif level == 1:
-                        # Subsections (A. Footings and Foundations, B. Slab-on-Grade, etc.)
-                        letter_counter += 1
-                        letter = chr(ord('A') + letter_counter - 1)
-                        lines.append(f"{letter}. {text}")
-                        
-                        # Reset number counter for items under this subsection
-                        number_counter = 0
-                        
-                    elif level == 2:
-                        # Items under subsections (1., 2., 3., etc.)
-                        number_counter += 1
-                        lines.append(f"    {number_counter}. {text}")
-                        
-                    else:
-                        # Deeper levels (rare, but handle gracefully)
-                        indent = "    " * (level - 1)
-                        sub_number = len([x for x in lines if x.strip().startswith(f"{indent}")]) + 1
-                        lines.append(f"{indent}{sub_number}. {text}")
-                    
-                    # Recursively process children
-                    child_lines = recurse(child, prefix_stack + [str(i)], level == 0)
-                    lines.extend(child_lines)
-                    
-            return lines
-
-        root = self.tree.invisibleRootItem()
-        result_lines = recurse(root, [])
-        
-        # Clean up the output - remove excessive empty lines
-        cleaned_lines = []
-        prev_empty = False
-        
-        for line in result_lines:
-            if line.strip():
-                cleaned_lines.append(line)
-                prev_empty = False
-            elif not prev_empty:  # Only add one empty line at a time
-                cleaned_lines.append("")
-                prev_empty = True
-        
-        return "\n".join(cleaned_lines)
+        return lines_to_text(self.generate_scope_lines())
+
+    def _emit_scope(self):
+        lines = self.generate_scope_lines()
+        self.scopeLinesChanged.emit(lines)
+        # Joining the text costs a pass over every line; skip it if unused
+        if self.receivers(self.scopeChanged):
+            self.scopeChanged.emit(lines_to_text(lines))
 
     def get_checked_paths(self):
-        def recurse(item, path_so_far):
-            paths = []
-            for i in range(item.childCount()):
-                child = item.child(i)
-                current_path = path_so_far + [child.text(0)]
-                if child.checkState(0) == Qt.CheckState.Checked:
-                    paths.append(current_path)
-                paths.extend(recurse(child, current_path))
-            return paths
-
-        return recurse(self.tree.invisibleRootItem(), [])
-
-    def set_checked_paths(self, paths):
-        def recurse(item, path_so_far):
-            for i in range(item.childCount()):
-                child = item.child(i)
-                current_path = path_so_far + [child.text(0)]
-                if current_path in paths:
-                    child.setCheckState(0, Qt.CheckState.Checked)
-                recurse(child, current_path)
-
-        recurse(self.tree.invisibleRootItem(), [])
\ No newline at end of file
+        return get_checked_paths(self.model.root.children)
+
+    def get_checked_ids(self):
+        """Checked node IDs, or None if the template has not been given IDs yet"""
+        nodes = self.model.root.children
+        return get_checked_ids(nodes) if has_node_ids(nodes) else None
+
+    def restore_project(self, project):
+        """Check the nodes saved in a project, by ID or by legacy title path"""
+        with self.bulk_update("Restore Checked Items"):
+            for node in checked_nodes(project, self.model.root.children):
+                self.set_check_state(node, True)
@@ -1,10 +1,14 @@
 from PyQt6.QtWidgets import (
-    QDialog, QVBoxLayout, QTreeWidget, QTreeWidgetItem,
+    QDialog, QVBoxLayout, QTreeView,
     QPushButton, QHBoxLayout, QFileDialog, QMessageBox,
     QInputDialog, QCheckBox
 )
 from PyQt6.QtCore import Qt
-import json
+from logic.scope_model import (
+    ScopeNode, assign_node_ids, load_template_data, nodes_from_sections, sections_from_nodes
+)
+from logic.atomic_write import DEFAULT_BACKUPS, atomic_write_json
+from ui.scope_tree_model import ScopeTreeModel
 
 
 class TemplateEditorDialog(QDialog):
@@ -16,12 +20,16 @@ class TemplateEditorDialog(QDialog):
         self.layout = QVBoxLayout()
         self.setLayout(self.layout)
 
-        self.tree = QTreeWidget()
-        self.tree.setHeaderLabels(["Scope Item"])
-        self.tree.setDragDropMode(QTreeWidget.DragDropMode.InternalMove)
+        self.model = ScopeTreeModel(parent=self)
+        # High-water mark for node IDs, stored in the template as "next_id"
+        self.next_node_id = None
+
+        self.tree = QTreeView()
+        self.tree.setModel(self.model)
+        self.tree.setUniformRowHeights(True)
+        self.tree.setDragDropMode(QTreeView.DragDropMode.InternalMove)
         self.tree.setDefaultDropAction(Qt.DropAction.MoveAction)
-        self.tree.setEditTriggers(QTreeWidget.EditTrigger.DoubleClicked)
-        self.tree.setColumnCount(1)
+        self.tree.setEditTriggers(QTreeView.EditTrigger.DoubleClicked)
         self.layout.addWidget(self.tree)
 
         # Buttons
@@ -51,61 +59,44 @@ class TemplateEditorDialog(QDialog):
         self.btn_save.clicked.connect(self.save_template)
         self.btn_close.clicked.connect(self.accept)
 
+    def current_node(self):
+        index = self.tree.currentIndex()
+        return self.model.node_from_index(index) if index.isValid() else None
+
     def add_item(self):
-        selected = self.tree.currentItem()
+        selected = self.current_node()
         text, ok = QInputDialog.getText(self, "Add Item", "Enter scope item text:")
         if ok and text:
-            new_item = QTreeWidgetItem([text])
-            new_item.setFlags(new_item.flags() | Qt.ItemFlag.ItemIsEditable)
             if selected:
-                selected.addChild(new_item)
-                selected.setExpanded(True)
+                self.model.append_nodes(selected, [ScopeNode(text)])
+                self.tree.setExpanded(self.model.index_for(selected), True)
             else:
-                self.tree.invisibleRootItem().addChild(new_item)
+                self.model.append_nodes(self.model.root, [ScopeNode(text)])
 
     def delete_item(self):
-        selected = self.tree.currentItem()
-        if selected:
-            parent = selected.parent()
-            if parent:
-                parent.removeChild(selected)
-            else:
-                self.tree.invisibleRootItem().removeChild(selected)
+        index = self.tree.currentIndex()
+        if index.isValid():
+            self.model.removeRows(index.row(), 1, index.parent())
 
     def toggle_lock(self):
-        item = self.tree.currentItem()
-        if item:
-            locked = item.data(0, Qt.ItemDataRole.UserRole) == "locked"
-            if locked:
-                item.setFlags(item.flags() | Qt.ItemFlag.ItemIsEditable)
-                item.setToolTip(0, "")
-                item.setData(0, Qt.ItemDataRole.UserRole, "")
-            else:
-                item.setFlags(item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                item.setToolTip(0, "🔒 Locked")
-                item.setData(0, Qt.ItemDataRole.UserRole, "locked")
+        node = self.current_node()
+        if node:
+            self.model.set_node_value(node, "locked", not node.locked)
 
     def toggle_highlight(self):
-        item = self.tree.currentItem()
-        if item:
-            highlighted = item.foreground(0) == Qt.GlobalColor.darkYellow
-            if highlighted:
-                item.setForeground(0, Qt.GlobalColor.black)
-                item.setData(0, Qt.ItemDataRole.UserRole + 1, "")
-            else:
-                item.setForeground(0, Qt.GlobalColor.darkYellow)
-                item.setData(0, Qt.ItemDataRole.UserRole + 1, "highlight")
+        node = self.current_node()
+        if node:
+            self.model.set_node_value(node, "highlight", not node.highlight)
 
     def load_template(self):
         file_path, _ = QFileDialog.getOpenFileName(self, "Load Template", "", "JSON Files (*.json)")
         if file_path:
             try:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    self.tree.clear()
-                    self.setWindowTitle(f"Editing: {file_path}")
-                    self.build_tree(data.get("sections", []), self.tree.invisibleRootItem())
-                    self.loaded_file_path = file_path
+                data = load_template_data(file_path)
+                self.setWindowTitle(f"Editing: {file_path}")
+                self.model.set_nodes(nodes_from_sections(data.get("sections", [])))
+                self.loaded_file_path = file_path
+                self.next_node_id = data.get("next_id")
             except Exception as e:
                 QMessageBox.critical(self, "Error", f"Failed to load template:\n{str(e)}")
 
@@ -118,50 +109,15 @@ class TemplateEditorDialog(QDialog):
                 return
 
         try:
+            # Saved projects refer to nodes by these IDs, so existing ones never
+            # change and the IDs of deleted nodes are not reused
+            self.next_node_id = assign_node_ids(self.model.root.children, self.next_node_id)
             data = {
                 "template_name": "Template",
-                "sections": self.extract_tree(self.tree.invisibleRootItem())
+                "next_id": self.next_node_id,
+                "sections": sections_from_nodes(self.model.root.children)
             }
-            with open(path, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=4)
+            atomic_write_json(path, data, indent=4, backups=DEFAULT_BACKUPS)
             QMessageBox.information(self, "Saved", "Template saved successfully.")
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to save template:\n{str(e)}")
-
-    def build_tree(self, items, parent):
-        for item in items:
-            label = item.get("title", item.get("text", "Untitled"))
-            node = QTreeWidgetItem([label])
-            node.setFlags(node.flags() | Qt.ItemFlag.ItemIsEditable)
-
-            if item.get("locked", False):
-                node.setFlags(node.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                node.setToolTip(0, "🔒 Locked")
-                node.setData(0, Qt.ItemDataRole.UserRole, "locked")
-
-            if item.get("highlight", False):
-                node.setForeground(0, Qt.GlobalColor.darkYellow)
-                node.setData(0, Qt.ItemDataRole.UserRole + 1, "highlight")
-
-            parent.addChild(node)
-
-            if "children" in item:
-                self.build_tree(item["children"], node)
-
-    def extract_tree(self, parent):
-        items = []
-        for i in range(parent.childCount()):
-            node = parent.child(i)
-            label = node.text(0)
-            locked = node.data(0, Qt.ItemDataRole.UserRole) == "locked"
-            highlight = node.data(0, Qt.ItemDataRole.UserRole + 1) == "highlight"
-            child = {
-                "title": label,
-                "locked": locked,
-                "highlight": highlight
-            }
-            children = self.extract_tree(node)
-            if children:
-                child["children"] = children
-            items.append(child)
-        return items
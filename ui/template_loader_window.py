@@ -1,11 +1,14 @@
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLineEdit,
-    QTableWidget, QTableWidgetItem, QPushButton,
+    QTableView, QPushButton,
     QFileDialog, QMessageBox, QHeaderView
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QTimer
+from logic.library_index import get_library_index
+from logic.search_index import get_search_index
+from ui.background_tasks import LibraryIndexNotifier
+from ui.library_table_model import FILTER_DELAY_MS, LibraryFilterProxyModel, LibraryTableModel
 import os
-from datetime import datetime
 
 
 class TemplateLoaderWindow(QWidget):
@@ -16,21 +19,43 @@ class TemplateLoaderWindow(QWidget):
         self.folder_path = folder_path
         self.load_callback = load_callback
 
+        # Shared index of the folder, kept current by a watchdog observer
+        self.library_index = get_library_index(folder_path)
+        self.index_notifier = LibraryIndexNotifier(self.library_index, self)
+        self.index_notifier.changed.connect(self.populate_templates)
+        # Full-text index of every scope item title, refreshed with the library index
+        self.search_index = get_search_index(folder_path)
+
         self.layout = QVBoxLayout(self)
 
         # Search bar
         search_layout = QHBoxLayout()
         self.search_input = QLineEdit()
-        self.search_input.setPlaceholderText("Filter templates...")
-        self.search_input.textChanged.connect(self.filter_templates)
+        self.search_input.setPlaceholderText("Filter templates or search scope items...")
         search_layout.addWidget(self.search_input)
         self.layout.addLayout(search_layout)
 
+        # Filter once typing pauses rather than on every keystroke
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(FILTER_DELAY_MS)
+        self.filter_timer.timeout.connect(lambda: self.filter_templates(self.search_input.text()))
+        self.search_input.textChanged.connect(self.filter_timer.start)
+
         # Table of templates
-        self.table = QTableWidget(0, 2)
-        self.table.setHorizontalHeaderLabels(["Template Name", "Last Modified"])
+        self.model = LibraryTableModel("Template Name", self)
+        self.proxy = LibraryFilterProxyModel(self)
+        self.proxy.setSourceModel(self.model)
+
+        self.table = QTableView()
+        self.table.setModel(self.proxy)
+        self.table.setSortingEnabled(True)
+        self.table.sortByColumn(0, Qt.SortOrder.AscendingOrder)
+        self.table.verticalHeader().hide()
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
-        self.table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        self.table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        self.table.setSelectionMode(QTableView.SelectionMode.SingleSelection)
+        self.table.doubleClicked.connect(lambda index: self.load_selected_template())
         self.layout.addWidget(self.table)
 
         # Buttons
@@ -51,41 +76,36 @@ class TemplateLoaderWindow(QWidget):
 
         self.layout.addLayout(button_layout)
 
-        # Populate list
-        self.populate_templates()
-
     def populate_templates(self):
-        self.table.setRowCount(0)
-        if not os.path.exists(self.folder_path):
-            os.makedirs(self.folder_path)
-
-        for file in sorted(os.listdir(self.folder_path)):
-            if file.endswith(".json"):
-                full_path = os.path.join(self.folder_path, file)
-                row = self.table.rowCount()
-                self.table.insertRow(row)
-
-                self.table.setItem(row, 0, QTableWidgetItem(file))
-                self.table.setItem(row, 1, QTableWidgetItem(
-                    self.format_date(os.path.getmtime(full_path)))
-                )
+        self.model.set_entries(self.library_index.entries())
+        # Content matches may have changed along with the files
+        self.filter_templates(self.search_input.text())
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        # The index stays current while hidden; only the table needs refreshing
+        self.index_notifier.attach()
+        self.populate_templates()
 
-    def format_date(self, timestamp):
-        return datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M")
+    def hideEvent(self, event):
+        # Stop live updates while the window is not visible
+        self.index_notifier.detach()
+        super().hideEvent(event)
 
     def filter_templates(self, text):
-        for row in range(self.table.rowCount()):
-            item = self.table.item(row, 0)
-            visible = text.lower() in item.text().lower()
-            self.table.setRowHidden(row, not visible)
+        # Templates match by fuzzy file name or by any scope item containing the words
+        content_matches = {}
+        for result in self.search_index.search(text, limit=1000):
+            content_matches.setdefault(result.template, " > ".join(result.path))
+        self.proxy.set_pattern(text, content_matches)
 
     def load_selected_template(self):
-        selected = self.table.currentRow()
-        if selected == -1:
+        selected = self.table.currentIndex()
+        if not selected.isValid():
             QMessageBox.warning(self, "No Selection", "Please select a template to open.")
             return
 
-        filename = self.table.item(selected, 0).text()
+        filename = self.proxy.entry_for(selected).name
         path = os.path.join(self.folder_path, filename)
         self.load_callback(path)
         self.close()